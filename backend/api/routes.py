@@ -14,6 +14,12 @@ from pathlib import Path
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+# Optional: orjson serializes long transcriptions (thousands of word dicts) much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Rate limiter instance
 limiter = Limiter(key_func=get_remote_address)
 
@@ -82,6 +88,16 @@ def get_analyzer():
     return ClipAnalyzer()
 
 
+def dumps_json(data) -> str:
+    """Serialize transcription data for storage (orjson when available, stdlib json otherwise)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass
+    return json.dumps(data)
+
+
 # Progress tracking weights for each step (must sum to 100)
 STEP_WEIGHTS = {
     'downloading': 15,    # 0-15%
@@ -259,7 +275,7 @@ def process_video(project_id: int, language: str = None):
 
         transcription = transcriber.transcribe_video(project.video_path, language=transcription_language)
         project.audio_path = transcription.get('audio_path')
-        project.transcription = json.dumps(transcription)
+        project.transcription = dumps_json(transcription)
 
         update_progress(db, project, ProjectStatus.TRANSCRIBING.value, 40,
                        "Transcrição concluída!")
@@ -385,7 +401,7 @@ def process_video(project_id: int, language: str = None):
                 subtitle_data=subtitle_result.get('subtitle_data'),
                 subtitle_file=subtitle_result.get('subtitle_file'),
                 has_burned_subtitles=subtitle_result.get('has_burned_subtitles', False),
-                transcription_segment=json.dumps(segment),
+                transcription_segment=dumps_json(segment),
                 categoria=suggestion.get('category', 'insight')
             )
             db.add(clip)
@@ -43,9 +43,10 @@ DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data")).resolve()
 VIDEOS_DIR = (DATA_DIR / "videos").resolve()
 CLIPS_DIR = (DATA_DIR / "clips").resolve()
 AUDIO_DIR = (DATA_DIR / "audio").resolve()
+TRANSCRIPTION_CACHE_DIR = (DATA_DIR / "transcriptions").resolve()
 
 # Create directories if they don't exist
-for dir_path in [VIDEOS_DIR, CLIPS_DIR, AUDIO_DIR]:
+for dir_path in [VIDEOS_DIR, CLIPS_DIR, AUDIO_DIR, TRANSCRIPTION_CACHE_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
 # Database
@@ -55,6 +56,8 @@ DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR}/database.db")
 # Groq API (FREE cloud API - fast and high quality)
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+# Whisper transcription requests per minute allowed by the Groq plan (free tier: 20)
+GROQ_RPM = max(1, _safe_int(os.getenv("GROQ_RPM", "20"), 20, "GROQ_RPM"))
 
 # Minimax API (uses Anthropic-compatible endpoint)
 MINIMAX_API_KEY = os.getenv("MINIMAX_API_KEY", "")
@@ -115,6 +118,15 @@ if WHISPER_MODEL not in VALID_WHISPER_MODELS:
     print(f"⚠️  WHISPER_MODEL inválido: '{WHISPER_MODEL}', usando 'base'")
     WHISPER_MODEL = "base"
 
+# Audio extraction speed/quality for the Groq MP3 (libmp3lame algorithm quality)
+# fast = -compression_level 7 (~half the encoder CPU, no audible loss for 16kHz speech)
+# balanced = -compression_level 5 (lame default)
+EXTRACT_QUALITY = os.getenv("EXTRACT_QUALITY", "fast")
+VALID_EXTRACT_QUALITIES = ["fast", "balanced"]
+if EXTRACT_QUALITY not in VALID_EXTRACT_QUALITIES:
+    print(f"⚠️  EXTRACT_QUALITY inválido: '{EXTRACT_QUALITY}', usando 'fast'")
+    EXTRACT_QUALITY = "fast"
+
 # Download settings - RETRY mechanism
 DOWNLOAD_MAX_RETRIES = _safe_int(os.getenv("DOWNLOAD_MAX_RETRIES", "3"), 3, "DOWNLOAD_MAX_RETRIES")
 DOWNLOAD_RETRY_DELAY = _safe_int(os.getenv("DOWNLOAD_RETRY_DELAY", "5"), 5, "DOWNLOAD_RETRY_DELAY")
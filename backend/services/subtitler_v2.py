@@ -8,10 +8,13 @@ Melhorias:
 - Animações opcionais e mais suaves
 - Melhor estrutura de chunks para legendas
 """
+import os
 import re
 import subprocess
+import sys
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from config import (
     CLIPS_DIR,
@@ -41,6 +44,14 @@ except ImportError:
     SUBTITLE_STYLE_TYPE = "hormozi"
     SUBTITLE_MAX_WORDS_PER_LINE = 4
 
+# Numba (opcional) - compila o chunking para transcrições muito longas
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 @dataclass
 class SubtitleStyle:
@@ -152,6 +163,20 @@ WORD_COLORS = {
     }
 }
 
+# Cores mais consultadas, resolvidas uma vez
+DEFAULT_COLOR = WORD_COLORS['default']['color']
+NUMBERS_COLOR = WORD_COLORS['numbers']['color']
+
+# Encoders H.264 para burn-in, em ordem de preferência (hardware primeiro)
+H264_ENCODER_ARGS = {
+    'h264_nvenc': ['-c:v', 'h264_nvenc', '-preset', 'p4', '-cq', '23'],
+    'h264_videotoolbox': ['-c:v', 'h264_videotoolbox', '-q:v', '65'],
+    'libx264': ['-c:v', 'libx264', '-preset', 'fast', '-crf', '23'],
+}
+
+# Remove pontuação antes do lookup de cores
+_WORD_STRIP_RE = re.compile(r'[^\w]')
+
 # Estilo Hormozi - Configurações
 HORMOZI_STYLE = {
     'font_size': 52,  # Fonte grande
@@ -163,6 +188,58 @@ HORMOZI_STYLE = {
 }
 
 
+# Transcrições com pelo menos este número de palavras usam o chunking compilado
+NUMBA_CHUNK_MIN_WORDS = 2000
+
+
+def _chunk_breaks(
+    word_lens,
+    starts,
+    ends,
+    max_chars: int,
+    max_words: int,
+    max_pause: float,
+    max_duration: float,
+    breaks
+) -> int:
+    """
+    Calcula os índices onde cada chunk de legenda começa.
+
+    Preenche `breaks` com o índice da primeira palavra de cada chunk e
+    retorna o número de chunks. Usa apenas aritmética sobre sequências
+    para poder ser compilado com Numba sem alterações.
+    """
+    n = len(word_lens)
+    if n == 0:
+        return 0
+
+    count = 1
+    breaks[0] = 0
+    chunk_first = 0
+    current_chars = word_lens[0]
+
+    for i in range(1, n):
+        word_len = word_lens[i]
+        chunk_start = starts[chunk_first]
+
+        if (current_chars + word_len + 1 > max_chars
+                or i - chunk_first >= max_words
+                or starts[i] - ends[i - 1] > max_pause
+                or (chunk_start != 0 and ends[i] - chunk_start > max_duration)):
+            breaks[count] = i
+            count += 1
+            chunk_first = i
+            current_chars = word_len
+        else:
+            current_chars += word_len + 1
+
+    return count
+
+
+if NUMBA_AVAILABLE:
+    _chunk_breaks_jit = njit(cache=True)(_chunk_breaks)
+
+
 class SubtitleGeneratorV2:
     """
     Gerador de legendas V2 com tamanho consistente.
@@ -194,6 +271,12 @@ class SubtitleGeneratorV2:
         # Configurações de chunking baseadas no estilo
         self.max_words_per_line = SUBTITLE_MAX_WORDS_PER_LINE if SUBTITLE_STYLE_TYPE != "hormozi" else 3
 
+        # Encoder H.264 para burn-in (detectado no primeiro uso)
+        self._video_encoder = None
+
+        # Geradores de texto especializados por (modo, cores, capitalização)
+        self._emitter_cache = {}
+
     def _build_word_color_lookup(self) -> Dict[str, str]:
         """Constrói lookup de cores por palavra."""
         lookup = {}
@@ -201,18 +284,30 @@ class SubtitleGeneratorV2:
             if category == 'default':
                 continue
             for word in data['words']:
-                lookup[word.lower()] = data['color']
+                # Chaves internadas: lookups com palavras internadas comparam por identidade
+                lookup[sys.intern(word.lower())] = data['color']
         return lookup
 
     def _get_word_color(self, word: str) -> str:
         """Retorna cor para uma palavra."""
-        clean_word = re.sub(r'[^\w]', '', word.lower())
+        clean_word = sys.intern(_WORD_STRIP_RE.sub('', word.lower()))
 
         # Números
         if clean_word.isdigit():
-            return WORD_COLORS['numbers']['color']
+            return NUMBERS_COLOR
 
-        return self._word_color_lookup.get(clean_word, WORD_COLORS['default']['color'])
+        return self._word_color_lookup.get(clean_word, DEFAULT_COLOR)
+
+    def _color_resolver(self, enable_colors: bool) -> Callable[[str], str]:
+        """
+        Retorna a função de cor a usar nos loops de geração de texto.
+
+        Com cores desativadas, retorna uma função constante (cor padrão),
+        evitando o teste de enable_colors a cada palavra.
+        """
+        if enable_colors:
+            return self._get_word_color
+        return lambda word, _default=DEFAULT_COLOR: _default
 
     # =========================================================================
     # Formatação de tempo
@@ -220,18 +315,16 @@ class SubtitleGeneratorV2:
 
     def _format_ass_time(self, seconds: float) -> str:
         """Converte segundos para formato ASS (H:MM:SS.cc)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        centis = int((seconds % 1) * 100)
+        secs, centis = divmod(int(seconds * 100), 100)
+        minutes, secs = divmod(secs, 60)
+        hours, minutes = divmod(minutes, 60)
         return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
 
     def _format_srt_time(self, seconds: float) -> str:
         """Converte segundos para formato SRT (HH:MM:SS,mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
+        secs, millis = divmod(int(seconds * 1000), 1000)
+        minutes, secs = divmod(secs, 60)
+        hours, minutes = divmod(minutes, 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
     # =========================================================================
@@ -246,9 +339,6 @@ class SubtitleGeneratorV2:
         max_pause: float = 0.3,
         max_duration: float = 2.5
     ) -> List[List[Dict[str, Any]]]:
-        # Usar configuração padrão se não especificado
-        if max_words is None:
-            max_words = getattr(self, 'max_words_per_line', 4)
         """
         Agrupa palavras em chunks para legendas.
 
@@ -257,59 +347,46 @@ class SubtitleGeneratorV2:
         - Máximo de palavras por linha
         - Pausa detectada entre palavras
         - Duração máxima da legenda
+
+        As decisões de quebra são feitas por _chunk_breaks (compilado com
+        Numba para transcrições longas, quando disponível).
         """
-        chunks = []
-        current_chunk = []
-        current_chars = 0
-        chunk_start = None
+        # Usar configuração padrão se não especificado
+        if max_words is None:
+            max_words = getattr(self, 'max_words_per_line', 4)
 
-        for i, word_dict in enumerate(words):
+        # Palavras vazias não entram em nenhum chunk
+        valid_words = []
+        word_lens = []
+        for word_dict in words:
             word = word_dict.get('word', '').strip()
-            if not word:
-                continue
-
-            word_start = word_dict.get('start', 0)
-            word_end = word_dict.get('end', 0)
-            word_len = len(word)
-
-            # Verificar se deve iniciar novo chunk
-            should_break = False
-
-            if current_chunk:
-                # Verificar limite de caracteres
-                if current_chars + word_len + 1 > max_chars:
-                    should_break = True
-
-                # Verificar limite de palavras
-                if len(current_chunk) >= max_words:
-                    should_break = True
-
-                # Verificar pausa
-                prev_end = current_chunk[-1].get('end', 0)
-                if word_start - prev_end > max_pause:
-                    should_break = True
-
-                # Verificar duração
-                if chunk_start and word_end - chunk_start > max_duration:
-                    should_break = True
-
-            if should_break and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = []
-                current_chars = 0
-                chunk_start = None
-
-            # Adicionar palavra ao chunk atual
-            current_chunk.append(word_dict)
-            current_chars += word_len + (1 if current_chars > 0 else 0)
-            if chunk_start is None:
-                chunk_start = word_start
-
-        # Adicionar último chunk
-        if current_chunk:
-            chunks.append(current_chunk)
+            if word:
+                valid_words.append(word_dict)
+                word_lens.append(len(word))
+
+        total = len(valid_words)
+        starts = [w.get('start', 0) for w in valid_words]
+        ends = [w.get('end', 0) for w in valid_words]
+
+        if NUMBA_AVAILABLE and total >= NUMBA_CHUNK_MIN_WORDS:
+            breaks = np.empty(total, dtype=np.int64)
+            count = _chunk_breaks_jit(
+                np.asarray(word_lens, dtype=np.int64),
+                np.asarray(starts, dtype=np.float64),
+                np.asarray(ends, dtype=np.float64),
+                max_chars, max_words, max_pause, max_duration, breaks
+            )
+            breaks = breaks[:count].tolist()
+        else:
+            breaks = [0] * total
+            count = _chunk_breaks(
+                word_lens, starts, ends,
+                max_chars, max_words, max_pause, max_duration, breaks
+            )
+            del breaks[count:]
 
-        return chunks
+        breaks.append(total)
+        return [valid_words[breaks[k]:breaks[k + 1]] for k in range(count)]
 
     # =========================================================================
     # Cálculo de escala para resolução
@@ -408,59 +485,67 @@ class SubtitleGeneratorV2:
         )
 
         # Cabeçalho ASS
-        ass_content = self._generate_ass_header(
+        header = self._generate_ass_header(
             playres_x, playres_y, scaled_style, enable_karaoke
         )
 
         # Gerar chunks
         chunks = self._chunk_words(words)
 
-        # Gerar diálogos
-        for chunk in chunks:
-            if not chunk:
-                continue
+        # Escolher o gerador de texto uma única vez, baseado no estilo
+        style_type = getattr(style, 'style_type', 'default')
+        if style_type == "hormozi":
+            # Estilo Hormozi - viral, impactante
+            mode = "hormozi"
+            style_name = "Karaoke"  # Usa o estilo Karaoke para highlight
+        elif enable_karaoke or style_type == "karaoke":
+            mode = "karaoke"
+            style_name = "Karaoke"
+        else:
+            mode = "simple"
+            style_name = "Default"
+        emit_text = self._get_text_emitter(mode, enable_colors, capitalize)
+        format_time = self._format_ass_time
 
-            start_time = max(0, chunk[0].get('start', 0) - offset)
-            end_time = max(start_time + 0.1, chunk[-1].get('end', 0) - offset)
+        # Gerar diálogos, escrevendo cada linha direto no arquivo
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(header)
 
-            # Ajustar timestamps das palavras
-            adjusted_chunk = []
-            for w in chunk:
-                adjusted_chunk.append({
-                    'word': w.get('word', ''),
-                    'start': max(0, w.get('start', 0) - offset),
-                    'end': max(0, w.get('end', 0) - offset)
-                })
-
-            # Gerar texto do diálogo baseado no estilo
-            style_type = getattr(style, 'style_type', 'default')
-
-            if style_type == "hormozi":
-                # Estilo Hormozi - viral, impactante
-                text = self._generate_hormozi_text(adjusted_chunk, enable_colors)
-                style_name = "Karaoke"  # Usa o estilo Karaoke para highlight
-            elif enable_karaoke or style_type == "karaoke":
-                text = self._generate_karaoke_text(
-                    adjusted_chunk, enable_colors, capitalize
-                )
-                style_name = "Karaoke"
-            else:
-                text = self._generate_simple_text(
-                    adjusted_chunk, enable_colors, capitalize
-                )
-                style_name = "Default"
+            for chunk in chunks:
+                if not chunk:
+                    continue
 
-            if text:
-                start_str = self._format_ass_time(start_time)
-                end_str = self._format_ass_time(end_time)
-                ass_content += f"Dialogue: 0,{start_str},{end_str},{style_name},,0,0,0,,{text}\n"
+                start_time = max(0, chunk[0].get('start', 0) - offset)
+                end_time = max(start_time + 0.1, chunk[-1].get('end', 0) - offset)
 
-        # Salvar arquivo
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(ass_content)
+                # Ajustar timestamps das palavras
+                adjusted_chunk = self._shift_words(chunk, offset)
+
+                # Gerar texto do diálogo
+                text = emit_text(adjusted_chunk)
+
+                if text:
+                    start_str = format_time(start_time)
+                    end_str = format_time(end_time)
+                    f.write(f"Dialogue: 0,{start_str},{end_str},{style_name},,0,0,0,,{text}\n")
 
         return str(output_path)
 
+    def _shift_words(
+        self,
+        words: List[Dict[str, Any]],
+        offset: float
+    ) -> List[Dict[str, Any]]:
+        """Copia palavras com timestamps deslocados pelo offset (mínimo 0)."""
+        return [
+            {
+                'word': w.get('word', ''),
+                'start': max(0, w.get('start', 0) - offset),
+                'end': max(0, w.get('end', 0) - offset)
+            }
+            for w in words
+        ]
+
     def _generate_ass_header(
         self,
         playres_x: int,
@@ -495,146 +580,115 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
         return header
 
-    def _generate_simple_text(
+    def _case_words(
         self,
         words: List[Dict[str, Any]],
-        enable_colors: bool,
         capitalize: bool
-    ) -> str:
-        """Gera texto simples com cores opcionais."""
-        if not words:
-            return ""
-
-        parts = []
-        default_color = WORD_COLORS['default']['color']
-
-        for i, word_dict in enumerate(words):
-            word = word_dict.get('word', '').strip()
-            if not word:
-                continue
-
-            # Capitalização
-            if capitalize:
-                if i == 0:
-                    word = word[0].upper() + word[1:].lower() if len(word) > 1 else word.upper()
-                else:
-                    word = word.lower()
-
-            # Cores
-            if enable_colors:
-                color = self._get_word_color(word)
-                if color != default_color:
-                    parts.append(f"{{\\1c{color}}}{word}{{\\1c{default_color}}}")
-                else:
-                    parts.append(word)
-            else:
-                parts.append(word)
+    ) -> List[str]:
+        """
+        Limpa e capitaliza as palavras de um chunk em uma única passada.
 
-        return ' '.join(parts)
+        Primeira palavra com inicial maiúscula, demais em minúsculas.
+        """
+        clean_words = [w.get('word', '').strip() for w in words]
+        if capitalize and clean_words:
+            return [clean_words[0].capitalize()] + [w.lower() for w in clean_words[1:]]
+        return clean_words
 
-    def _generate_karaoke_text(
+    def _get_text_emitter(
         self,
-        words: List[Dict[str, Any]],
+        mode: str,
         enable_colors: bool,
         capitalize: bool
-    ) -> str:
-        """
-        Gera texto com efeito karaokê.
-
-        Usa tag \\kf para fill suave (mais profissional que \\k).
-        """
-        if not words:
-            return ""
-
-        parts = []
-        highlight_color = SUBTITLE_HIGHLIGHT_COLOR
-        default_color = WORD_COLORS['default']['color']
-
-        for i, word_dict in enumerate(words):
-            word = word_dict.get('word', '').strip()
-            if not word:
-                continue
-
-            start = word_dict.get('start', 0)
-            end = word_dict.get('end', 0)
-
-            # Duração em centissegundos
-            duration_cs = max(1, int((end - start) * 100))
-
-            # Capitalização
-            if capitalize:
-                if i == 0:
-                    word = word[0].upper() + word[1:].lower() if len(word) > 1 else word.upper()
-                else:
-                    word = word.lower()
-
-            # Determinar cor
-            if enable_colors:
-                word_color = self._get_word_color(word)
-                if word_color == default_color:
-                    word_color = highlight_color
-            else:
-                word_color = highlight_color
-
-            # Tag karaokê: \kf = fill suave (mais bonito que \k)
-            tag = f"\\kf{duration_cs}\\1c{word_color}"
-
-            parts.append(f"{{{tag}}}{word}")
-
-        return ' '.join(parts)
-
-    def _generate_hormozi_text(
+    ) -> Callable[[List[Dict[str, Any]]], str]:
+        """Retorna (com cache por instância) o gerador de texto para o modo."""
+        key = (mode, enable_colors, capitalize)
+        emitter = self._emitter_cache.get(key)
+        if emitter is None:
+            emitter = self._make_text_emitter(mode, enable_colors, capitalize)
+            self._emitter_cache[key] = emitter
+        return emitter
+
+    def _make_text_emitter(
         self,
-        words: List[Dict[str, Any]],
-        enable_colors: bool = True
-    ) -> str:
-        """
-        Gera texto no estilo Hormozi - legendas virais impactantes.
-
-        Características:
-        - TUDO MAIÚSCULO
-        - Palavras destacadas individualmente
-        - Cores vibrantes por categoria
-        - Efeito de aparecimento gradual
+        mode: str,
+        enable_colors: bool,
+        capitalize: bool
+    ) -> Callable[[List[Dict[str, Any]]], str]:
         """
-        if not words:
-            return ""
+        Cria a função que gera o texto de um diálogo, especializada no modo.
 
-        parts = []
-        default_color = WORD_COLORS['default']['color']
-        highlight_color = "&H00FFFF&"  # Amarelo para destaque
+        Modos:
+        - "simple": texto simples com cores opcionais
+        - "karaoke": tag \\kf por palavra (fill suave, mais profissional que \\k)
+        - "hormozi": legendas virais - TUDO MAIÚSCULO, palavras destacadas
+          individualmente com cores vibrantes por categoria
 
-        for i, word_dict in enumerate(words):
-            word = word_dict.get('word', '').strip()
-            if not word:
-                continue
+        Cores, capitalização e constantes de tags são resolvidas aqui, uma
+        única vez, em vez de a cada palavra.
+        """
+        default_color = DEFAULT_COLOR
+        get_color = self._color_resolver(enable_colors)
+
+        if mode == "simple":
+            # Tag de fechamento é constante
+            default_close = f"{{\\1c{default_color}}}"
+
+            def emit_simple(words: List[Dict[str, Any]]) -> str:
+                parts = []
+                for word in self._case_words(words, capitalize):
+                    if not word:
+                        continue
+
+                    color = get_color(word)
+                    if color != default_color:
+                        parts.append(f"{{\\1c{color}}}{word}{default_close}")
+                    else:
+                        parts.append(word)
+
+                return ' '.join(parts)
+
+            return emit_simple
+
+        # Karaokê e Hormozi: palavras sem categoria usam a cor de destaque
+        highlight_color = "&H00FFFF&" if mode == "hormozi" else SUBTITLE_HIGHLIGHT_COLOR
+        _max, _int = max, int
+
+        # Retorna (palavras para lookup de cor, palavras exibidas)
+        if mode == "hormozi":
+            # Cor pela palavra original; UPPERCASE só no texto exibido
+            def case_words(words):
+                originals = [w.get('word', '').strip() for w in words]
+                return originals, [w.upper() for w in originals]
+        else:
+            def case_words(words):
+                cased = self._case_words(words, capitalize)
+                return cased, cased
 
-            start = word_dict.get('start', 0)
-            end = word_dict.get('end', 0)
+        def emit_karaoke(words: List[Dict[str, Any]]) -> str:
+            parts = []
+            color_words, shown_words = case_words(words)
+            for word_dict, color_word, word in zip(words, color_words, shown_words):
+                if not word:
+                    continue
 
-            # UPPERCASE para estilo Hormozi
-            word = word.upper()
+                start = word_dict.get('start', 0)
+                end = word_dict.get('end', 0)
 
-            # Duração em centissegundos
-            duration_cs = max(1, int((end - start) * 100))
+                # Duração em centissegundos
+                duration_cs = _max(1, _int((end - start) * 100))
 
-            # Determinar cor baseada na categoria da palavra
-            if enable_colors:
-                word_color = self._get_word_color(word.lower())
+                # Determinar cor baseada na categoria da palavra
+                word_color = get_color(color_word)
                 if word_color == default_color:
                     word_color = highlight_color
-            else:
-                word_color = highlight_color
 
-            # Estilo Hormozi: fade in + cor + scale sutil
-            # \fad(100,0) = fade in de 100ms
-            # \fscx110\fscy110 = escala 110%
-            # \t(\fscx100\fscy100) = anima de volta para 100%
-            tag = f"\\kf{duration_cs}\\1c{word_color}"
+                # Tag karaokê: \kf = fill suave + cor da palavra
+                parts.append(f"{{\\kf{duration_cs}\\1c{word_color}}}{word}")
 
-            parts.append(f"{{{tag}}}{word}")
+            return ' '.join(parts)
 
-        return ' '.join(parts)
+        return emit_karaoke
 
     # =========================================================================
     # Geração SRT
@@ -651,26 +705,23 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         output_path = Path(output_path)
         chunks = self._chunk_words(words)
 
-        lines = []
-        for i, chunk in enumerate(chunks, 1):
-            if not chunk:
-                continue
-
+        format_time = self._format_srt_time
+        blocks = []
+        for i, chunk in enumerate((c for c in chunks if c), 1):
             start_time = max(0, chunk[0].get('start', 0) - offset)
             end_time = max(start_time + 0.1, chunk[-1].get('end', 0) - offset)
 
             text = ' '.join(w.get('word', '') for w in chunk).strip()
-            if capitalize and text:
+            if not text:
+                continue
+            if capitalize:
                 text = text[0].upper() + text[1:].lower()
 
-            if text:
-                lines.append(str(i))
-                lines.append(f"{self._format_srt_time(start_time)} --> {self._format_srt_time(end_time)}")
-                lines.append(text)
-                lines.append('')
+            # Bloco completo: índice, tempos e texto
+            blocks.append(f"{i}\n{format_time(start_time)} --> {format_time(end_time)}\n{text}\n")
 
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+            f.write('\n'.join(blocks))
 
         return str(output_path)
 
@@ -703,40 +754,55 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         else:
             output_path = Path(output_path)
 
-        # Copiar legenda para arquivo temporário sem espaços
+        # Expor legenda em caminho temporário sem espaços (symlink evita copiar o arquivo)
         import tempfile
         import shutil
 
         temp_dir = tempfile.mkdtemp()
         temp_sub = Path(temp_dir) / f"subtitle{subtitle_path.suffix}"
-        shutil.copy2(subtitle_path, temp_sub)
+        try:
+            os.symlink(str(subtitle_path.resolve()), str(temp_sub))
+        except (OSError, NotImplementedError):
+            shutil.copy2(subtitle_path, temp_sub)
+
+        # Escapar ':' (ex: letra de drive no Windows) para o parser de filtros
+        filter_path = temp_sub.as_posix().replace(':', r'\:')
 
         try:
             # Comando FFmpeg
             if subtitle_path.suffix.lower() == '.ass':
                 # ASS: usar filtro ass
-                filter_str = f"ass='{temp_sub}'"
+                filter_str = f"ass='{filter_path}'"
             else:
                 # SRT: usar filtro subtitles com force_style
-                filter_str = f"subtitles='{temp_sub}':force_style='FontName=Arial,FontSize=24,PrimaryColour=&HFFFFFF,OutlineColour=&H000000,Outline=2'"
-
-            cmd = [
-                'ffmpeg',
-                '-i', str(video_path),
-                '-vf', filter_str,
-                '-c:v', 'libx264',
-                '-preset', 'fast',
-                '-crf', '23',
-                '-c:a', 'copy',
-                '-y',
-                str(output_path)
-            ]
-
-            print(f"Queimando legendas: {video_path}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                print(f"Erro FFmpeg: {result.stderr[:500]}")
+                filter_str = f"subtitles='{filter_path}':force_style='FontName=Arial,FontSize=24,PrimaryColour=&HFFFFFF,OutlineColour=&H000000,Outline=2'"
+
+            def build_cmd(encoder: str) -> List[str]:
+                return [
+                    'ffmpeg',
+                    '-hide_banner',
+                    '-loglevel', 'error',
+                    '-i', str(video_path),
+                    '-vf', filter_str,
+                    *H264_ENCODER_ARGS[encoder],
+                    '-threads', '0',
+                    '-c:a', 'copy',
+                    '-y',
+                    str(output_path)
+                ]
+
+            encoder = self._get_video_encoder()
+            print(f"Queimando legendas ({encoder}): {video_path}")
+            returncode, stderr_tail = self._run_ffmpeg(build_cmd(encoder))
+
+            if returncode != 0 and encoder != 'libx264':
+                # Encoder de hardware listado mas indisponível (ex: sem GPU)
+                print(f"Encoder {encoder} falhou, usando libx264...")
+                self._video_encoder = 'libx264'
+                returncode, stderr_tail = self._run_ffmpeg(build_cmd('libx264'))
+
+            if returncode != 0:
+                print(f"Erro FFmpeg: {stderr_tail[-500:]}")
                 # Fallback: copiar vídeo sem legendas
                 shutil.copy2(video_path, output_path)
 
@@ -745,6 +811,64 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         finally:
             shutil.rmtree(temp_dir, ignore_errors=True)
 
+    def _get_video_encoder(self) -> str:
+        """Detecta (uma única vez) o melhor encoder H.264 disponível no FFmpeg."""
+        if self._video_encoder is None:
+            self._video_encoder = 'libx264'
+            try:
+                result = subprocess.run(
+                    ['ffmpeg', '-hide_banner', '-encoders'],
+                    capture_output=True, text=True, timeout=10
+                )
+                for encoder in H264_ENCODER_ARGS:
+                    if encoder == 'libx264':
+                        break
+                    if f" {encoder} " in result.stdout and self._probe_video_encoder(encoder):
+                        self._video_encoder = encoder
+                        break
+            except (OSError, subprocess.SubprocessError):
+                pass
+        return self._video_encoder
+
+    def _probe_video_encoder(self, encoder: str) -> bool:
+        """
+        Testa o encoder com um encode real de 1 frame.
+
+        '-encoders' lista h264_nvenc em qualquer build compilado com ele, mesmo
+        sem GPU NVIDIA; só o encode de verdade mostra se o hardware existe.
+        """
+        try:
+            result = subprocess.run(
+                [
+                    'ffmpeg', '-hide_banner', '-loglevel', 'error', '-nostdin',
+                    '-f', 'lavfi', '-i', 'nullsrc=s=256x256',
+                    '-frames:v', '1',
+                    '-c:v', encoder,
+                    '-f', 'null', '-'
+                ],
+                capture_output=True, timeout=15
+            )
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return result.returncode == 0
+
+    def _run_ffmpeg(self, cmd: List[str]) -> Tuple[int, str]:
+        """
+        Executa FFmpeg sem acumular a saída em memória.
+
+        Retorna (returncode, últimas linhas do stderr) para diagnóstico.
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace'
+        )
+        stderr_tail = deque(process.stderr, maxlen=50)
+        process.wait()
+        return process.returncode, ''.join(stderr_tail)
+
     # =========================================================================
     # Interface de alto nível
     # =========================================================================
@@ -851,24 +975,16 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             end_time = max(start_time + 0.1, chunk[-1].get('end', 0) - offset)
 
             text = ' '.join(w.get('word', '') for w in chunk).strip()
-            text = text[0].upper() + text[1:].lower() if text else text
-
-            adjusted_words = []
-            for w in chunk:
-                adjusted_words.append({
-                    'word': w.get('word', ''),
-                    'start': max(0, w.get('start', 0) - offset),
-                    'end': max(0, w.get('end', 0) - offset)
-                })
-
-            if text:
-                subtitle_data.append({
-                    'id': f'sub_{i}',
-                    'start': start_time,
-                    'end': end_time,
-                    'text': text,
-                    'words': adjusted_words
-                })
+            if not text:
+                continue
+
+            subtitle_data.append({
+                'id': f'sub_{i}',
+                'start': start_time,
+                'end': end_time,
+                'text': text.capitalize(),
+                'words': self._shift_words(chunk, offset)
+            })
 
         return subtitle_data
 
@@ -4,18 +4,245 @@ Supports Groq Whisper API (fast) and local Whisper (fallback)
 Optimized for speed: MP3 compression, parallel chunks, smart retries
 """
 import json
+import math
+import os
+import random
+import re
 import subprocess
+import tempfile
+import threading
 import httpx
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from config import (
     AUDIO_DIR,
+    EXTRACT_QUALITY,
     WHISPER_MODEL,
     WHISPER_LANGUAGE,
-    GROQ_API_KEY
+    GROQ_API_KEY,
+    GROQ_RPM
 )
+from . import transcript_cache
+
+# PyAV reads container headers in-process (no ffprobe spawn) when installed
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+# orjson parses/serializes large word-level transcripts ~2-5x faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP/2 for the Groq client needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# MPEG audio Layer III header tables (index = header field value)
+_MP3_BITRATES = {
+    'mpeg1': (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    'mpeg2': (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {
+    3: ('mpeg1', (44100, 48000, 32000)),
+    2: ('mpeg2', (22050, 24000, 16000)),
+    0: ('mpeg2', (11025, 12000, 8000)),  # MPEG 2.5
+}
+
+
+def _probe_mp3_header(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read an MP3's format and duration straight from its first frame header,
+    without spawning ffprobe: duration comes from the Xing/Info frame count
+    when present, otherwise from file size / bitrate (CBR, e.g. ffmpeg pipe output)
+
+    Returns:
+        Same dict shape as WhisperTranscriber._probe_audio, or None if the file
+        isn't a recognisable Layer III stream or its duration can't be derived
+    """
+    with open(path, 'rb') as f:
+        data = f.read(64 * 1024)
+        size = os.fstat(f.fileno()).st_size
+
+    # Skip ID3v2 tag (syncsafe size)
+    pos = 0
+    if data[:3] == b'ID3' and len(data) >= 10:
+        pos = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+        if pos + 4 > len(data):
+            return None
+
+    # First frame sync: 11 set bits, Layer III, valid bitrate/sample rate
+    while pos + 4 <= len(data):
+        b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+        if data[pos] == 0xFF and (b1 & 0xE0) == 0xE0 and ((b1 >> 1) & 3) == 1:
+            version = (b1 >> 3) & 3
+            bitrate_index = b2 >> 4
+            rate_index = (b2 >> 2) & 3
+            if version in _MP3_SAMPLE_RATES and 0 < bitrate_index < 15 and rate_index < 3:
+                break
+        pos += 1
+    else:
+        return None
+
+    family, rates = _MP3_SAMPLE_RATES[version]
+    sample_rate = rates[rate_index]
+    bit_rate = _MP3_BITRATES[family][bitrate_index] * 1000
+    channels = 1 if (b3 >> 6) == 3 else 2
+    samples_per_frame = 1152 if family == 'mpeg1' else 576
+
+    # Xing/Info tag sits after the side info of the first frame
+    side_info = (17 if channels == 1 else 32) if family == 'mpeg1' else (9 if channels == 1 else 17)
+    tag_pos = pos + 4 + side_info
+    tag = data[tag_pos:tag_pos + 4]
+    duration = None
+    if tag in (b'Xing', b'Info') and len(data) >= tag_pos + 12:
+        flags = int.from_bytes(data[tag_pos + 4:tag_pos + 8], 'big')
+        frames = int.from_bytes(data[tag_pos + 8:tag_pos + 12], 'big') if flags & 1 else 0
+        if frames:
+            duration = frames * samples_per_frame / sample_rate
+        # The tag frame's own bitrate isn't the stream's: VBR has none,
+        # CBR's is recovered from the payload size
+        if tag == b'Xing':
+            bit_rate = 0
+        elif duration:
+            bit_rate = round((size - pos) * 8 / duration / 1000) * 1000
+    if duration is None and tag != b'Xing':
+        duration = (size - pos) * 8 / bit_rate
+
+    if duration is None:
+        return None
+    return {
+        'duration': duration,
+        'codec_name': 'mp3',
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'bit_rate': bit_rate
+    }
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket pacing requests to a per-minute budget.
+    throttle() halves the rate for a cool-down period (AIMD-style back-off
+    after a 429); the base rate comes back once it expires.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._restore_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self._restore_at and now >= self._restore_at:
+            self.rate = self.base_rate
+            self._restore_at = 0.0
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, cooldown: float = 60.0):
+        """Halve the rate (floor: 1 request/min) for cooldown seconds"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.rate / 2, 1 / 60)
+            self._restore_at = time.monotonic() + cooldown
+
+
+# One budget per process, shared by every transcriber instance and chunk worker
+# (TranscriberV2's Groq backend included)
+_groq_bucket = _TokenBucket(rate=GROQ_RPM / 60.0, capacity=GROQ_RPM)
+
+
+def _retry_delay(attempt: int, base_delay: float, retry_after: Optional[str] = None) -> float:
+    """
+    Backoff delay: server's Retry-After (seconds, capped at 60s), or exponential
+    with +/-50% multiplicative jitter (capped at 30s) so parallel chunks that hit
+    the same 429 don't retry in lockstep
+    """
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), 60.0)
+        except ValueError:
+            pass  # HTTP-date form: fall back to exponential backoff
+    return min(30.0, base_delay * (2 ** attempt) * (1 + random.uniform(-0.5, 0.5)))
+
+
+@lru_cache(maxsize=2)
+def _shared_whisper_model(model_name: str, workers: int) -> tuple:
+    """
+    Load a local Whisper model once per interpreter and share it between
+    WhisperTranscriber instances (cached until release_shared_models())
+    Prefers faster-whisper (CTranslate2, ~4x faster, int8 quantized),
+    falls back to openai-whisper if it isn't installed
+
+    Returns:
+        (model, is_faster_whisper)
+    """
+    try:
+        import ctranslate2
+        from faster_whisper import WhisperModel
+    except ImportError:
+        import whisper
+        print(f"Loading local Whisper model: {model_name}")
+        return whisper.load_model(model_name), False
+
+    cuda = ctranslate2.get_cuda_device_count() > 0
+    print(f"Loading local faster-whisper model: {model_name} ({'cuda' if cuda else 'cpu'})")
+    model = WhisperModel(
+        model_name,
+        device="auto",
+        compute_type="int8_float16" if cuda else "int8",
+        num_workers=workers,
+        cpu_threads=max(1, (os.cpu_count() or 2) // workers)
+    )
+    return model, True
+
+
+def release_shared_models():
+    """
+    Drop the process-wide local Whisper models loaded by _shared_whisper_model.
+    Memory is only freed once no WhisperTranscriber still holds the model
+    (see WhisperTranscriber.unload_model); the next local transcription reloads it.
+    """
+    import gc
+    _shared_whisper_model.cache_clear()
+    gc.collect()
+    # Clear CUDA cache if available (torch is optional with faster-whisper)
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+    print("Shared Whisper models released")
 
 
 class WhisperTranscriber:
@@ -26,42 +253,77 @@ class WhisperTranscriber:
 
     GROQ_API_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
     GROQ_MODEL = "whisper-large-v3-turbo"  # Fastest model with word timestamps
+    GROQ_MAX_UPLOAD = 25 * 1024 * 1024  # Groq upload limit (25MB)
+    # MP3 64kbps mono 16kHz for Groq; lame algorithm quality 7 (fast) or 5 (balanced)
+    MP3_ENCODE_ARGS = [
+        '-acodec', 'libmp3lame', '-b:a', '64k',
+        '-compression_level', '7' if EXTRACT_QUALITY == 'fast' else '5',
+        '-ar', '16000', '-ac', '1'
+    ]
+    # Chunk uploads in flight: enough to keep the RPM budget busy while each
+    # request waits ~20s on Groq (rate x latency = RPM / 3), capped at 16
+    GROQ_MAX_PARALLEL = min(16, max(4, math.ceil(GROQ_RPM / 3)))
+    GROQ_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})  # Transient: retry before falling back
+    # Chunks with less non-silent audio than this (seconds) are answered locally
+    # instead of uploaded; an absolute floor so long chunks never drop real speech
+    SILENCE_FILTER = 'silencedetect=noise=-40dB:d=0.5'
+    SILENT_CHUNK_MAX_SPEECH = 2.0
+    LOCAL_CHUNK_SECONDS = 30  # Target length of silence-split parts for parallel local transcription
+    LOCAL_PARALLEL_MIN_DURATION = 60  # Shorter files stay on a single pass
+    LOCAL_QUALITY_PRESETS = ("fast", "balanced", "accurate")
+    LOCAL_SAMPLE_RATE = 16000  # Whisper input rate
 
     def __init__(self, model_name: str = None):
         self.model_name = model_name or WHISPER_MODEL
         self.model = None  # Lazy load for local whisper
+        self._faster_whisper = False  # True when self.model is a faster-whisper (CTranslate2) model
+        self._local_workers = max(1, (os.cpu_count() or 2) // 2)  # Parallel faster-whisper workers
         self.audio_dir = AUDIO_DIR
         self.use_groq = bool(GROQ_API_KEY)
+        self._timerange_index = None  # Cached bisect index of the last transcription queried
+        self._http = None  # Long-lived Groq client: pooled keep-alive connections
 
         if self.use_groq:
+            self._http = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(300.0, connect=10.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.GROQ_MAX_PARALLEL,
+                    max_connections=16
+                ),
+                headers={'Authorization': f'Bearer {GROQ_API_KEY}'}
+            )
             print("Transcriber: Using Groq Whisper API (fast mode)")
         else:
             print("Transcriber: Using local Whisper (set GROQ_API_KEY for faster transcription)")
 
+    def close(self):
+        """Close the pooled Groq HTTP client"""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _load_local_model(self):
-        """Lazy load local Whisper model"""
+        """Lazy load local Whisper model (shared across instances, see _shared_whisper_model)"""
         if self.model is None:
-            import whisper
-            print(f"Loading local Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
+            self.model, self._faster_whisper = _shared_whisper_model(self.model_name, self._local_workers)
         return self.model
 
     def unload_model(self):
         """
-        Unload Whisper model from memory to free GPU/CPU resources.
-        Call this after transcription is complete.
+        Drop this instance's reference to the local Whisper model.
+        The model itself stays cached for other instances; call
+        release_shared_models() to actually free its GPU/CPU memory.
         """
         if self.model is not None:
-            import gc
-            import torch
-            print("Unloading Whisper model from memory...")
-            del self.model
             self.model = None
-            gc.collect()
-            # Clear CUDA cache if available
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            print("Whisper model unloaded")
+            print("Whisper model reference released")
 
     def extract_audio(self, video_path: str, output_path: Optional[str] = None, for_groq: bool = None) -> str:
         """
@@ -91,14 +353,13 @@ class WhisperTranscriber:
         # FFmpeg command - MP3 for Groq (smaller/faster), WAV for local
         if use_mp3:
             # MP3 64kbps mono - optimal for speech, ~8MB for 30 min
+            # (or the source track as-is when it already is low-rate mono MP3)
             cmd = [
                 'ffmpeg',
                 '-i', str(video_path),
                 '-vn',  # No video
-                '-acodec', 'libmp3lame',
-                '-b:a', '64k',  # 64kbps bitrate
-                '-ar', '16000',  # 16kHz sample rate
-                '-ac', '1',  # Mono
+                '-threads', '0',  # All cores for decode/resample
+                *self._mp3_codec_args(video_path),
                 '-y',  # Overwrite
                 str(output_path)
             ]
@@ -108,6 +369,7 @@ class WhisperTranscriber:
                 'ffmpeg',
                 '-i', str(video_path),
                 '-vn',  # No video
+                '-threads', '0',  # All cores for decode/resample
                 '-acodec', 'pcm_s16le',  # PCM format
                 '-ar', '16000',  # 16kHz sample rate (Whisper default)
                 '-ac', '1',  # Mono
@@ -136,6 +398,52 @@ class WhisperTranscriber:
 
         return str(output_path)
 
+    def _mp3_codec_args(self, video_path: str) -> List[str]:
+        """
+        FFmpeg codec args for Groq MP3 output: stream copy when the source track is
+        already mono MP3 at <=16kHz and <=80kbps (e.g. podcast downloads), skipping
+        libmp3lame entirely; otherwise encode to MP3 64kbps mono 16kHz
+        """
+        try:
+            probe = self._probe_audio(video_path)
+        except (OSError, ValueError) as e:
+            print(f"  Audio probe failed, re-encoding: {e}")
+            probe = None
+
+        if (probe and probe['codec_name'] == 'mp3' and probe['channels'] == 1
+                and 0 < probe['sample_rate'] <= 16000 and 0 < probe['bit_rate'] <= 80000):
+            return ['-map', '0:a:0', '-c:a', 'copy']
+
+        return self.MP3_ENCODE_ARGS
+
+    def _extract_audio_inmem(self, video_path: str) -> bytes:
+        """
+        Extract audio as MP3 64kbps mono 16kHz (same as extract_audio for Groq)
+        straight into memory through an ffmpeg pipe
+
+        Returns:
+            MP3 bytes
+        """
+        cmd = [
+            'ffmpeg',
+            '-i', str(video_path),
+            '-vn',  # No video
+            '-threads', '0',
+            *self._mp3_codec_args(video_path),
+            '-f', 'mp3',
+            'pipe:1'
+        ]
+        print(f"Extracting audio (MP3 64kbps, in memory): {video_path}")
+
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            print(f"FFmpeg audio extraction failed: {e.stderr.decode() if e.stderr else str(e)}")
+            raise
+
+        print(f"Audio extracted: {len(result.stdout) / (1024 * 1024):.1f}MB")
+        return result.stdout
+
     def _get_audio_mime_type(self, audio_path: str) -> str:
         """Get MIME type based on audio file extension"""
         ext = Path(audio_path).suffix.lower()
@@ -148,26 +456,46 @@ class WhisperTranscriber:
         }
         return mime_types.get(ext, 'audio/wav')
 
-    def _groq_request_with_retry(self, audio_path: str, language: str = None, chunk_name: str = None) -> Dict[str, Any]:
+    def _groq_request_with_retry(
+        self,
+        audio: Union[str, bytes],
+        language: str = None,
+        chunk_name: str = None
+    ) -> Dict[str, Any]:
         """
         Make Groq API request with exponential backoff retry
-        Timeout: 120s, Retries: 3 (1s, 2s, 4s delays)
+        Timeout: 120s, Retries: 3 (~1s, 2s, 4s delays +/-50% jitter, or the server's Retry-After)
+        Retries timeouts, network errors, 429 and 5xx; other 4xx and request errors fail immediately
+        In-memory audio is reused as-is across retries; on-disk chunks are re-streamed
+        (from the page cache) rather than held in memory
 
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or in-memory audio bytes
             language: Language code (None for auto-detect)
-            chunk_name: Optional name for chunk
+            chunk_name: Optional name for chunk (required for in-memory audio)
         """
         max_retries = 3
         base_delay = 1.0
         timeout = 120.0  # Reduced from 300s
 
-        mime_type = self._get_audio_mime_type(audio_path)
-        filename = chunk_name or Path(audio_path).name
+        in_memory = isinstance(audio, bytes)
+        filename = chunk_name or Path(audio).name
+        mime_type = self._get_audio_mime_type(filename)
+        http = self._http or httpx
+
+        # Groq rejects oversized uploads with 413: fail before spending any attempt
+        size = len(audio) if in_memory else os.path.getsize(audio)
+        if size > self.GROQ_MAX_UPLOAD:
+            raise ValueError(
+                f"{filename} is {size / 1024 / 1024:.1f}MB, over the Groq "
+                f"{self.GROQ_MAX_UPLOAD // 1024 // 1024}MB upload limit"
+            )
 
         for attempt in range(max_retries + 1):
             try:
-                with open(audio_path, 'rb') as audio_file:
+                # File objects are streamed by httpx's multipart encoder in 64KB reads,
+                # so on-disk audio is never fully loaded into memory
+                with (nullcontext(audio) if in_memory else open(audio, 'rb')) as audio_file:
                     files = {
                         'file': (filename, audio_file, mime_type),
                     }
@@ -179,11 +507,16 @@ class WhisperTranscriber:
                     # Only add language if specified (None = auto-detect)
                     if language is not None:
                         data['language'] = language
-                    headers = {
+                    # Pooled client carries the auth header; one-off requests need it explicitly
+                    headers = None if self._http is not None else {
                         'Authorization': f'Bearer {GROQ_API_KEY}',
                     }
 
-                    response = httpx.post(
+                    # Client-side pacing to the Groq RPM budget
+                    _groq_bucket.acquire()
+
+                    # Pooled client when available: no new TCP/TLS handshake per request
+                    response = http.post(
                         self.GROQ_API_URL,
                         files=files,
                         data=data,
@@ -192,91 +525,110 @@ class WhisperTranscriber:
                     )
 
                     if response.status_code == 200:
+                        if ORJSON_AVAILABLE:
+                            return orjson.loads(response.content)
                         return response.json()
 
-                    # Rate limit - wait and retry
+                    # Rate limit / transient server error - wait and retry
                     if response.status_code == 429:
-                        if attempt < max_retries:
-                            delay = base_delay * (2 ** attempt)
-                            print(f"  Rate limited, retrying in {delay}s...")
-                            time.sleep(delay)
-                            continue
+                        _groq_bucket.throttle()
+
+                    if response.status_code in self.GROQ_RETRY_STATUSES and attempt < max_retries:
+                        delay = _retry_delay(attempt, base_delay, response.headers.get('Retry-After'))
+                        print(f"  Groq returned {response.status_code}, retrying in {delay:.1f}s...")
+                        time.sleep(delay)
+                        continue
 
                     raise Exception(f"Groq API error: {response.status_code} - {response.text}")
 
             except httpx.TimeoutException:
                 if attempt < max_retries:
-                    delay = base_delay * (2 ** attempt)
-                    print(f"  Timeout, retrying in {delay}s...")
+                    delay = _retry_delay(attempt, base_delay)
+                    print(f"  Timeout, retrying in {delay:.1f}s...")
                     time.sleep(delay)
                     continue
                 raise Exception(f"Groq API timeout after {max_retries + 1} attempts")
 
-            except httpx.RequestError as e:
+            except (httpx.NetworkError, httpx.RemoteProtocolError) as e:
+                # Connect/read/write failures and dropped keep-alive connections are transient;
+                # other request errors (bad URL, protocol, decoding) are unrecoverable
                 if attempt < max_retries:
-                    delay = base_delay * (2 ** attempt)
-                    print(f"  Request error, retrying in {delay}s...")
+                    delay = _retry_delay(attempt, base_delay)
+                    print(f"  Network error ({type(e).__name__}), retrying in {delay:.1f}s...")
                     time.sleep(delay)
                     continue
                 raise Exception(f"Groq API request failed: {e}")
 
+            except httpx.RequestError as e:
+                raise Exception(f"Groq API request failed: {e}")
+
         raise Exception("Groq API failed after all retries")
 
-    def _transcribe_with_groq(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+    def _transcribe_with_groq(self, audio: Union[str, bytes], language: str = None) -> Dict[str, Any]:
         """
         Transcribe using Groq Whisper API (50x faster than local)
 
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or in-memory MP3 bytes
             language: Language code (None for auto-detect)
 
         Returns:
             Dict with transcription and word-level timestamps
         """
+        in_memory = isinstance(audio, bytes)
         lang_info = f" (language: {language})" if language else " (auto-detect)"
-        print(f"Transcribing with Groq Whisper API{lang_info}: {audio_path}")
+        source = f"in-memory audio ({len(audio) / 1024 / 1024:.1f}MB)" if in_memory else audio
+        print(f"Transcribing with Groq Whisper API{lang_info}: {source}")
 
         # Check file size (Groq limit is 25MB)
-        file_size = Path(audio_path).stat().st_size
-        max_size = 25 * 1024 * 1024  # 25MB
+        file_size = len(audio) if in_memory else Path(audio).stat().st_size
 
-        if file_size > max_size:
+        if file_size > self.GROQ_MAX_UPLOAD:
             print(f"Audio file too large for Groq ({file_size / 1024 / 1024:.1f}MB > 25MB), chunking...")
-            return self._transcribe_groq_chunked(audio_path, language)
+            with self._audio_file(audio) as audio_path:
+                return self._transcribe_groq_chunked(audio_path, language)
 
-        result = self._groq_request_with_retry(audio_path, language)
+        result = self._groq_request_with_retry(audio, language, chunk_name='audio.mp3' if in_memory else None)
         return self._parse_groq_response(result)
 
     def _transcribe_groq_chunked(self, audio_path: str, language: str = None) -> Dict[str, Any]:
         """
         Transcribe large audio files by splitting into chunks
-        OPTIMIZED: Processes up to 3 chunks in parallel for 3x speedup
+        OPTIMIZED: Processes up to GROQ_MAX_PARALLEL chunks in parallel over one pooled HTTP client
 
         Args:
             audio_path: Path to audio file
             language: Language code (None for auto-detect)
         """
-        import tempfile
-        import os
-
         chunk_duration = 600  # 10 minutes per chunk
-        max_parallel = 3  # Process up to 3 chunks simultaneously
+        max_parallel = self.GROQ_MAX_PARALLEL  # The RPM token bucket paces actual requests
         audio_path = Path(audio_path)
 
-        # Detect if source is MP3 for chunk extraction
-        is_mp3 = audio_path.suffix.lower() == '.mp3'
+        probe = self._probe_audio(audio_path)
+        total_duration = probe['duration']
 
-        # Get audio duration
-        cmd = [
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(audio_path)
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        total_duration = float(result.stdout.strip())
+        # Source already in upload format (extract_audio output): cut without re-encoding
+        if self._is_speech_format(probe, 'mp3', max_bit_rate=64000):
+            codec_args = ['-c:a', 'copy']
+        else:
+            codec_args = self.MP3_ENCODE_ARGS
+
+        chunk_count = max(1, math.ceil(total_duration / chunk_duration))
+        print(f"  Splitting into {chunk_count} chunks, processing {min(chunk_count, max_parallel)} in parallel")
+
+        # One ffmpeg pass writes every chunk (segment muxer): a single demux (stream copy)
+        # or a single encode, instead of one process per chunk. Each chunk is uploaded
+        # as soon as the muxer finishes it, overlapping chunking and upload
+        with tempfile.TemporaryDirectory(prefix='groq_chunks_') as chunk_dir:
+            try:
+                chunks = self._segment_audio(audio_path, chunk_duration, codec_args, Path(chunk_dir))
+                return self._transcribe_groq_chunks(
+                    audio_path, chunks, chunk_count, codec_args, max_parallel, language, total_duration
+                )
+            except subprocess.CalledProcessError as e:
+                print(f"  Segment split failed, extracting chunks one by one: {e.stderr[-200:].strip() if e.stderr else e}")
 
-        # Calculate chunks
+        # Segment fallback: per-chunk cuts, run inside the upload workers
         chunks = []
         current_time = 0
         chunk_num = 0
@@ -291,7 +643,106 @@ class WhisperTranscriber:
             })
             current_time = chunk_end
 
-        print(f"  Splitting into {len(chunks)} chunks, processing {min(len(chunks), max_parallel)} in parallel")
+        return self._transcribe_groq_chunks(
+            audio_path, chunks, len(chunks), codec_args, max_parallel, language, total_duration
+        )
+
+    def _segment_audio(
+        self,
+        audio_path: Path,
+        segment_time: float,
+        codec_args: List[str],
+        out_dir: Path
+    ) -> Iterator[Dict]:
+        """
+        Split audio into MP3 chunks with a single ffmpeg pass (segment muxer)
+        Yields each chunk as soon as ffmpeg has finished writing it: the segment
+        list goes to stdout, one CSV row (filename,start,end) per completed chunk
+        A second null output runs silencedetect in the same pass, so each chunk
+        also carries how much of it is silence
+
+        Yields:
+            Chunk dicts (num, start, end, duration, path, silence)
+
+        Raises:
+            subprocess.CalledProcessError if ffmpeg fails
+        """
+        cmd = [
+            'ffmpeg', '-y',
+            '-nostats',
+            '-i', str(audio_path),
+            '-map', '0:a:0',
+            '-threads', '0',
+            *codec_args,
+            '-f', 'segment',
+            '-segment_time', str(segment_time),
+            '-segment_format', 'mp3',
+            '-segment_list', 'pipe:1',
+            '-segment_list_type', 'csv',
+            '-reset_timestamps', '1',
+            str(out_dir / 'chunk_%03d.mp3'),
+            '-map', '0:a:0',
+            '-af', self.SILENCE_FILTER,
+            '-f', 'null', '-'
+        ]
+        # stderr to a file: a full stderr pipe could block ffmpeg while we read stdout
+        log_path = out_dir / 'ffmpeg.log'
+        with open(log_path, 'w') as log, subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=log, text=True) as proc:
+            num = 0
+            for line in proc.stdout:
+                if not line.strip():
+                    continue
+                # Actual cut times, used as timestamp offsets
+                name, start, end = line.strip().rsplit(',', 2)
+                start, end = float(start), float(end)
+                num += 1
+                yield {
+                    'num': num,
+                    'start': start,
+                    'end': end,
+                    'duration': end - start,
+                    'path': out_dir / name,
+                    'silence': self._silent_seconds(log_path.read_text(), start, end)
+                }
+
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=log_path.read_text())
+
+    def _silent_seconds(self, log: str, start: float, end: float) -> float:
+        """
+        Seconds of [start, end] covered by silence, from silencedetect's ffmpeg log
+        A silence still open at the end of the log is counted up to end
+        """
+        silent = 0.0
+        silence_start = None
+        for kind, value in re.findall(r'silence_(start|end): (-?[\d.]+)', log):
+            if kind == 'start':
+                silence_start = float(value)
+            elif silence_start is not None:
+                silent += max(0.0, min(float(value), end) - max(silence_start, start))
+                silence_start = None
+        if silence_start is not None:
+            silent += max(0.0, end - max(silence_start, start))
+        return silent
+
+    def _transcribe_groq_chunks(
+        self,
+        audio_path: Path,
+        chunks: Iterable[Dict],
+        chunk_count: int,
+        codec_args: List[str],
+        max_parallel: int,
+        language: str,
+        total_duration: float
+    ) -> Dict[str, Any]:
+        """
+        Upload chunks in parallel and merge the results in order
+        chunks may be a generator: each chunk is submitted as soon as it is produced
+        """
+
+        # Stream copy starts on the first packet at/after the seek point: shift its
+        # timestamps to 0 so the chunk has no negative start (re-encode already does)
+        stream_copy_args = ['-avoid_negative_ts', 'make_zero'] if 'copy' in codec_args else []
 
         def extract_and_transcribe_chunk(chunk_info: Dict) -> Dict:
             """Extract and transcribe a single chunk"""
@@ -299,50 +750,74 @@ class WhisperTranscriber:
             start_time = chunk_info['start']
             duration = chunk_info['duration']
 
-            # Use MP3 for chunks too (smaller, faster upload)
-            suffix = '.mp3' if is_mp3 else '.mp3'  # Always use MP3 for chunks
-            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-                chunk_path = tmp.name
-
-            try:
-                # Extract chunk as MP3 for faster upload
+            if 'path' in chunk_info:
+                # Already written by the segment muxer: upload streams it from disk
+                chunk_audio = str(chunk_info['path'])
+            else:
+                # Extract chunk as MP3 (smaller, faster upload) straight to memory
+                # -ss before -i: container-level seek instead of decoding up to the start
+                # (-t as input option too, so the silencedetect output stops at the chunk end)
                 cmd = [
                     'ffmpeg', '-y',
+                    '-nostats',
                     '-ss', str(start_time),
-                    '-i', str(audio_path),
                     '-t', str(duration),
-                    '-acodec', 'libmp3lame',
-                    '-b:a', '64k',
-                    '-ar', '16000',
-                    '-ac', '1',
-                    chunk_path
+                    '-i', str(audio_path),
+                    '-map', '0:a:0',  # Skip probing/mapping any video or cover-art stream
+                    '-threads', '0',
+                    *codec_args,
+                    *stream_copy_args,
+                    '-f', 'mp3',
+                    'pipe:1',
+                    '-map', '0:a:0',
+                    '-af', self.SILENCE_FILTER,
+                    '-f', 'null', '-'
                 ]
-                subprocess.run(cmd, check=True, capture_output=True)
-
-                print(f"  Transcribing chunk {chunk_num}/{len(chunks)} ({start_time:.0f}s - {chunk_info['end']:.0f}s)")
-
-                # Transcribe chunk with retry
-                chunk_result = self._groq_request_with_retry(
-                    chunk_path,
-                    language,
-                    chunk_name=f'chunk_{chunk_num}.mp3'
+                result = subprocess.run(cmd, check=True, capture_output=True)
+                chunk_audio = result.stdout
+                # Seeked input starts at 0 for the filter
+                chunk_info['silence'] = self._silent_seconds(
+                    result.stderr.decode('utf-8', 'replace'), 0.0, duration
                 )
 
+            non_silent = duration - chunk_info['silence']
+            if non_silent < self.SILENT_CHUNK_MAX_SPEECH:
+                # Nothing to transcribe: skip the upload and the rate-limit token
+                print(
+                    f"  Skipping silent chunk {chunk_num}/{chunk_count} "
+                    f"({start_time:.0f}s - {chunk_info['end']:.0f}s, {non_silent:.1f}s non-silent)"
+                )
+                if 'path' in chunk_info:
+                    chunk_info['path'].unlink()
                 return {
                     'num': chunk_num,
                     'start_offset': start_time,
-                    'result': chunk_result
+                    'result': {'text': '', 'segments': [], 'words': []}
                 }
 
+            print(f"  Transcribing chunk {chunk_num}/{chunk_count} ({start_time:.0f}s - {chunk_info['end']:.0f}s)")
+
+            # Transcribe chunk with retry
+            try:
+                chunk_result = self._groq_request_with_retry(
+                    chunk_audio,
+                    language,
+                    chunk_name=f'chunk_{chunk_num}.mp3'
+                )
             finally:
-                # Cleanup temp file
-                if os.path.exists(chunk_path):
-                    os.unlink(chunk_path)
+                if 'path' in chunk_info:
+                    chunk_info['path'].unlink()
 
-        # Process chunks in parallel
+            return {
+                'num': chunk_num,
+                'start_offset': start_time,
+                'result': chunk_result
+            }
+
+        # Process chunks in parallel, sharing the transcriber's connection pool across threads
         results_by_num = {}
         with ThreadPoolExecutor(max_workers=max_parallel) as executor:
-            futures = {executor.submit(extract_and_transcribe_chunk, chunk): chunk for chunk in chunks}
+            futures = [executor.submit(extract_and_transcribe_chunk, chunk) for chunk in chunks]
 
             for future in as_completed(futures):
                 chunk_result = future.result()
@@ -383,39 +858,48 @@ class WhisperTranscriber:
 
     def _parse_groq_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Parse Groq API response into our format"""
-        segments = []
-
-        for segment in result.get('segments', []):
-            segment_data = {
-                'id': segment.get('id'),
-                'start': segment.get('start'),
-                'end': segment.get('end'),
-                'text': segment.get('text', '').strip(),
+        # verbose_json always carries id/start/end/text per segment and
+        # word/start/end per word: subscript directly instead of .get()
+        segments = [
+            {
+                'id': segment['id'],
+                'start': segment['start'],
+                'end': segment['end'],
+                'text': segment['text'].strip(),
                 'words': []
             }
-            segments.append(segment_data)
+            for segment in result.get('segments', [])
+        ]
 
         # Process word-level timestamps
-        words_list = result.get('words', [])
-        all_words = []
-
-        for word_data in words_list:
-            word = {
-                'word': word_data.get('word', '').strip(),
-                'start': word_data.get('start'),
-                'end': word_data.get('end'),
+        all_words = [
+            {
+                'word': word_data['word'].strip(),
+                'start': word_data['start'],
+                'end': word_data['end'],
                 'probability': 1.0  # Groq doesn't return probability
             }
-            all_words.append(word)
+            for word_data in result.get('words', [])
+        ]
 
-        # Assign words to segments
+        # Assign words to segments: words sorted by start, so each segment
+        # jumps to its first candidate word and stops once past its end
+        word_starts = [w['start'] for w in all_words]
+        sorted_words = all_words
+        if any(a > b for a, b in zip(word_starts, word_starts[1:])):
+            sorted_words = sorted(all_words, key=lambda w: w['start'])
+            word_starts = [w['start'] for w in sorted_words]
         for segment in segments:
             segment_start = segment['start']
             segment_end = segment['end']
-            segment['words'] = [
-                w for w in all_words
-                if w['start'] >= segment_start and w['end'] <= segment_end
-            ]
+            segment_words = []
+            for i in range(bisect_left(word_starts, segment_start), len(sorted_words)):
+                w = sorted_words[i]
+                if w['start'] > segment_end:
+                    break
+                if w['end'] <= segment_end:
+                    segment_words.append(w)
+            segment['words'] = segment_words
 
         return {
             'text': result.get('text', '').strip(),
@@ -447,79 +931,370 @@ class WhisperTranscriber:
             'words': result.get('words', [])
         }
 
-    def _transcribe_local(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+    def _local_decode_options(self, quality: str) -> Dict[str, Any]:
+        """
+        Decoding options for a local quality preset
+
+        fast:     greedy decoding, no conditioning on previous text (~2x throughput)
+        balanced: config beam/best_of/temperature, no conditioning on previous text
+        accurate: config beam/best_of/temperature, conditioned on previous text
+        """
+        if quality not in self.LOCAL_QUALITY_PRESETS:
+            raise ValueError(f"Invalid quality '{quality}', expected one of {self.LOCAL_QUALITY_PRESETS}")
+
+        if quality == "fast":
+            return {
+                'temperature': 0.0,
+                'beam_size': 1,
+                'best_of': 1,
+                'condition_on_previous_text': False
+            }
+
+        # Import config for quality settings
+        from config import WHISPER_TEMPERATURE, WHISPER_BEAM_SIZE, WHISPER_BEST_OF
+
+        return {
+            'temperature': WHISPER_TEMPERATURE,
+            'beam_size': WHISPER_BEAM_SIZE,
+            'best_of': WHISPER_BEST_OF,
+            'condition_on_previous_text': quality == "accurate"
+        }
+
+    def _transcribe_local(self, audio_path: str, language: str = None, quality: str = "balanced") -> Dict[str, Any]:
         """
         Transcribe audio file using local Whisper
 
         Args:
             audio_path: Path to audio file
             language: Language code (None for auto-detect)
+            quality: Decoding preset - "fast", "balanced" or "accurate"
 
         Returns:
             Dict with transcription and word-level timestamps
         """
+        options = self._local_decode_options(quality)
         model = self._load_local_model()
 
         lang_info = f" (language: {language})" if language else " (auto-detect)"
-        print(f"Transcribing with local Whisper{lang_info}: {audio_path}")
+        print(f"Transcribing with local Whisper{lang_info}, {quality} preset: {audio_path}")
 
-        # Import config for quality settings
-        from config import WHISPER_TEMPERATURE, WHISPER_BEAM_SIZE, WHISPER_BEST_OF
+        if self._faster_whisper:
+            # Fast preset: VAD also skips shorter silences entirely
+            if quality == "fast":
+                options['vad_parameters'] = dict(min_silence_duration_ms=500)
+            return self._transcribe_faster_whisper(model, audio_path, language, options)
 
         result = model.transcribe(
             audio_path,
             language=language,  # None = auto-detect
             word_timestamps=True,
             verbose=False,
-            temperature=WHISPER_TEMPERATURE,
-            beam_size=WHISPER_BEAM_SIZE,
-            best_of=WHISPER_BEST_OF,
-            condition_on_previous_text=True,
+            **options,
             no_speech_threshold=0.6,
             logprob_threshold=-1.0,
             compression_ratio_threshold=2.4
         )
 
-        # Process segments with word timestamps
+        # Process segments with word timestamps (keys guaranteed with word_timestamps=True)
         segments = []
         all_words = []
+        append_segment = segments.append
+        extend_words = all_words.extend
 
         for segment in result.get('segments', []):
+            segment_words = [
+                {
+                    'word': word['word'].strip(),
+                    'start': word['start'],
+                    'end': word['end'],
+                    'probability': word['probability']
+                }
+                for word in segment.get('words', ())
+            ]
+            append_segment({
+                'id': segment['id'],
+                'start': segment['start'],
+                'end': segment['end'],
+                'text': segment['text'].strip(),
+                'words': segment_words
+            })
+            extend_words(segment_words)
+
+        return {
+            'text': result.get('text', '').strip(),
+            'language': result.get('language'),
+            'duration': segments[-1]['end'] if segments else 0,
+            'segments': segments,
+            'words': all_words
+        }
+
+    def _transcribe_faster_whisper(
+        self,
+        model,
+        audio_path: str,
+        language: str,
+        options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Transcribe with a faster-whisper model
+        Long files are split on silences and the pieces transcribed concurrently:
+        CTranslate2 releases the GIL, so the model's workers run in parallel threads
+        """
+        spans = []
+        if self._local_workers > 1:
+            probe = self._probe_audio(audio_path)
+            if probe['duration'] > self.LOCAL_PARALLEL_MIN_DURATION:
+                spans = self._split_on_silence(audio_path, probe['duration'])
+
+        if len(spans) < 2:
+            return self._faster_whisper_pass(model, audio_path, language, options)
+
+        print(f"  Split into {len(spans)} parts on silence, transcribing {self._local_workers} in parallel")
+
+        # Decode once with a single ffmpeg process; parts are slices of the samples
+        pcm = self._decode_pcm(audio_path)
+        sample_rate = self.LOCAL_SAMPLE_RATE
+
+        def transcribe_span(span):
+            start, end = span
+            samples = pcm[int(start * sample_rate):int(end * sample_rate)]
+            audio = samples.astype('float32') / 32768.0
+            return self._faster_whisper_pass(model, audio, span_language, options, offset=start)
+
+        # First part alone: fixes the language so every part decodes the same one
+        span_language = language
+        results = [transcribe_span(spans[0])]
+        span_language = results[0]['language']
+
+        with ThreadPoolExecutor(max_workers=self._local_workers) as executor:
+            results.extend(executor.map(transcribe_span, spans[1:]))
+
+        # Combine results in order
+        segments = []
+        all_words = []
+        for result in results:
+            for segment in result['segments']:
+                segment['id'] = len(segments)
+                segments.append(segment)
+            all_words.extend(result['words'])
+
+        return {
+            'text': ' '.join(r['text'] for r in results if r['text']),
+            'language': span_language,
+            'duration': segments[-1]['end'] if segments else 0,
+            'segments': segments,
+            'words': all_words
+        }
+
+    def _decode_pcm(self, audio_path: str):
+        """
+        Decode audio to 16kHz mono int16 samples with one ffmpeg run (raw PCM on stdout)
+
+        Returns:
+            numpy int16 array
+        """
+        import numpy as np
+
+        cmd = [
+            'ffmpeg',
+            '-i', str(audio_path),
+            '-vn',
+            '-threads', '0',
+            '-acodec', 'pcm_s16le',
+            '-ar', str(self.LOCAL_SAMPLE_RATE),
+            '-ac', '1',
+            '-f', 's16le',
+            'pipe:1'
+        ]
+        result = subprocess.run(cmd, check=True, capture_output=True)
+        return np.frombuffer(result.stdout, dtype=np.int16)
+
+    def _faster_whisper_pass(
+        self,
+        model,
+        audio,
+        language: str,
+        options: Dict[str, Any],
+        offset: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Single faster-whisper pass over a file path or float32 16kHz samples
+        Segments come from a generator, so they are formatted as they are decoded
+        """
+        segments_iter, info = model.transcribe(
+            audio,
+            language=language,  # None = auto-detect
+            word_timestamps=True,
+            vad_filter=True,
+            **options
+        )
+
+        segments = []
+        all_words = []
+        text_parts = []
+
+        for i, segment in enumerate(segments_iter):
             segment_data = {
-                'id': segment.get('id'),
-                'start': segment.get('start'),
-                'end': segment.get('end'),
-                'text': segment.get('text', '').strip(),
+                'id': i,
+                'start': segment.start + offset,
+                'end': segment.end + offset,
+                'text': segment.text.strip(),
                 'words': []
             }
 
-            for word in segment.get('words', []):
+            for word in segment.words or []:
                 word_data = {
-                    'word': word.get('word', '').strip(),
-                    'start': word.get('start'),
-                    'end': word.get('end'),
-                    'probability': word.get('probability')
+                    'word': word.word.strip(),
+                    'start': word.start + offset,
+                    'end': word.end + offset,
+                    'probability': word.probability
                 }
                 segment_data['words'].append(word_data)
                 all_words.append(word_data)
 
             segments.append(segment_data)
+            text_parts.append(segment_data['text'])
 
         return {
-            'text': result.get('text', '').strip(),
-            'language': result.get('language'),
+            'text': ' '.join(text_parts),
+            'language': info.language,
             'duration': segments[-1]['end'] if segments else 0,
             'segments': segments,
             'words': all_words
         }
 
-    def transcribe(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+    def _probe_audio(self, audio_path: str) -> Dict[str, Any]:
+        """
+        Probe duration and first audio stream format
+        MP3 files: read from the frame header in Python; otherwise PyAV when
+        installed (header read, no subprocess), ffprobe as a last resort
+
+        Returns:
+            Dict with duration (seconds), codec_name, sample_rate, channels, bit_rate
+        """
+        if Path(audio_path).suffix.lower() == '.mp3':
+            try:
+                probe = _probe_mp3_header(audio_path)
+                if probe is not None:
+                    return probe
+            except OSError as e:
+                print(f"  MP3 header probe failed: {e}")
+
+        if AV_AVAILABLE:
+            try:
+                with av.open(str(audio_path)) as container:
+                    if container.duration is not None:
+                        stream = container.streams.audio[0] if container.streams.audio else None
+                        codec = stream.codec_context if stream is not None else None
+                        return {
+                            'duration': container.duration / av.time_base,
+                            'codec_name': codec.codec.canonical_name if codec is not None else None,
+                            'sample_rate': (codec.sample_rate or 0) if codec is not None else 0,
+                            'channels': codec.channels if codec is not None else None,
+                            'bit_rate': (stream.bit_rate or 0) if stream is not None else 0
+                        }
+            except Exception as e:
+                print(f"  PyAV probe failed, using ffprobe: {e}")
+
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-select_streams', 'a:0',
+            '-show_entries', 'stream=codec_name,sample_rate,channels,bit_rate:format=duration',
+            '-of', 'json',
+            str(audio_path)
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        info = json.loads(result.stdout or '{}')
+        stream = (info.get('streams') or [{}])[0]
+        return {
+            'duration': float(info.get('format', {}).get('duration', 0)),
+            'codec_name': stream.get('codec_name'),
+            'sample_rate': int(stream.get('sample_rate') or 0),
+            'channels': stream.get('channels'),
+            'bit_rate': int(stream.get('bit_rate') or 0)
+        }
+
+    def _is_speech_format(self, probe: Dict[str, Any], codec: str, max_bit_rate: int = None) -> bool:
+        """Check if probed audio is already 16kHz mono in the given codec (safe to stream-copy)"""
+        if probe['codec_name'] != codec or probe['sample_rate'] != 16000 or probe['channels'] != 1:
+            return False
+        return max_bit_rate is None or 0 < probe['bit_rate'] <= max_bit_rate
+
+    def _split_on_silence(self, audio_path: str, total_duration: float) -> List[tuple]:
+        """
+        Split audio into ~LOCAL_CHUNK_SECONDS (start, end) spans, cutting only
+        in the middle of silences detected by ffmpeg so no word is cut in half
+
+        Returns:
+            List of (start, end) tuples covering the whole file
+        """
+        cmd = [
+            'ffmpeg', '-hide_banner', '-nostats',
+            '-i', str(audio_path),
+            '-af', 'silencedetect=n=-30dB:d=0.5',
+            '-f', 'null', '-'
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        silence_start = None
+        cut_points = []
+        last_cut = 0.0
+        for line in result.stderr.splitlines():
+            if 'silence_start:' in line:
+                silence_start = float(line.rsplit('silence_start:', 1)[1].split()[0])
+            elif 'silence_end:' in line and silence_start is not None:
+                silence_end = float(line.rsplit('silence_end:', 1)[1].split()[0])
+                cut = (silence_start + silence_end) / 2
+                silence_start = None
+                if cut - last_cut >= self.LOCAL_CHUNK_SECONDS and total_duration - cut >= self.LOCAL_CHUNK_SECONDS / 2:
+                    cut_points.append(cut)
+                    last_cut = cut
+
+        bounds = [0.0] + cut_points + [total_duration]
+        return list(zip(bounds, bounds[1:]))
+
+    @contextmanager
+    def _audio_file(self, audio: Union[str, bytes]):
+        """Yield a file path for audio, writing in-memory bytes to a temp MP3 for the duration"""
+        if not isinstance(audio, bytes):
+            yield audio
+            return
+
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp:
+            tmp.write(audio)
+        try:
+            yield tmp.name
+        finally:
+            os.unlink(tmp.name)
+
+    def _cache_backend(self, groq: bool, quality: str) -> str:
+        """Cache label of the backend that produced a result (quality only matters locally)"""
+        return f'groq:{self.GROQ_MODEL}' if groq else f'local:{self.model_name}:{quality}'
+
+    def _transcription_cache_path(self, content_hash: str, backend: str, language: str) -> Path:
+        """
+        Content-addressed cache file for a transcription (see transcript_cache)
+        Key: audio content hash plus every setting that changes the output
+        (backend/model as produced by _cache_backend, language)
+        """
+        return transcript_cache.cache_path(content_hash, 'v1', backend, language)
+
+    def transcribe(
+        self,
+        audio: Union[str, bytes],
+        language: str = None,
+        quality: str = "balanced",
+        cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Transcribe audio file (auto-selects best method)
 
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file, or in-memory MP3 bytes
             language: Language code (None or "auto" for auto-detect, default from config)
+            quality: Local Whisper preset - "fast", "balanced" or "accurate" (ignored by Groq)
+            cache: Reuse/store the result in TRANSCRIPTION_CACHE_DIR (default: True;
+                also disabled by CLIPGENIUS_NO_TRANSCRIPT_CACHE=1)
 
         Returns:
             Dict with transcription and word-level timestamps
@@ -530,35 +1305,84 @@ class WhisperTranscriber:
         elif language is None:
             language = WHISPER_LANGUAGE
 
+        content_hash = None
+        if cache and transcript_cache.cache_enabled():
+            content_hash = transcript_cache.audio_content_hash(audio)
+            cache_path = self._transcription_cache_path(
+                content_hash, self._cache_backend(self.use_groq, quality), language
+            )
+            result = transcript_cache.read(cache_path)
+            if result is not None:
+                print(f"Using cached transcription: {cache_path.name}")
+                return result
+
+        used_groq = False
         if self.use_groq:
             try:
-                return self._transcribe_with_groq(audio_path, language)
+                result = self._transcribe_with_groq(audio, language)
+                used_groq = True
             except Exception as e:
                 print(f"Groq transcription failed: {e}")
                 print("Falling back to local Whisper...")
-                return self._transcribe_local(audio_path, language)
+                with self._audio_file(audio) as audio_path:
+                    result = self._transcribe_local(audio_path, language, quality)
         else:
-            return self._transcribe_local(audio_path, language)
+            with self._audio_file(audio) as audio_path:
+                result = self._transcribe_local(audio_path, language, quality)
+
+        if content_hash is not None:
+            # Keyed by the backend that actually ran: a local fallback after a
+            # Groq failure must not answer later Groq lookups
+            cache_path = self._transcription_cache_path(
+                content_hash, self._cache_backend(used_groq, quality), language
+            )
+            transcript_cache.write(cache_path, result)
 
-    def transcribe_video(self, video_path: str, language: str = None, unload_after: bool = True) -> Dict[str, Any]:
+        return result
+
+    def transcribe_video(
+        self,
+        video_path: str,
+        language: str = None,
+        unload_after: bool = False,
+        quality: str = "balanced"
+    ) -> Dict[str, Any]:
         """
         Extract audio and transcribe video
 
         Args:
             video_path: Path to video file
             language: Language code
-            unload_after: Unload model after transcription to free memory (default: True)
+            unload_after: Drop this instance's model reference afterwards (default: False;
+                the model is shared, use release_shared_models() to free memory)
+            quality: Local Whisper preset - "fast", "balanced" or "accurate"
 
         Returns:
-            Dict with transcription and timestamps
+            Dict with transcription and timestamps. 'audio_path' is the extracted
+            audio file, or None when Groq transcribed it straight from memory
+            (audio up to GROQ_MAX_UPLOAD): no file is written, so there is
+            nothing to clean up or reuse
         """
         audio_path = None
         try:
-            # Extract audio
-            audio_path = self.extract_audio(video_path)
+            if self.use_groq:
+                # Groq: pipe MP3 straight from ffmpeg to the upload, no file in AUDIO_DIR
+                audio_bytes = self._extract_audio_inmem(video_path)
+                if len(audio_bytes) <= self.GROQ_MAX_UPLOAD:
+                    transcription = self.transcribe(audio_bytes, language, quality)
+                    transcription['audio_path'] = None
+                    return transcription
+
+                # Too large for one upload: keep it on disk for chunking
+                audio_path = str(self.audio_dir / f"{Path(video_path).stem}.mp3")
+                Path(audio_path).write_bytes(audio_bytes)
+                del audio_bytes
+            else:
+                # Extract audio
+                audio_path = self.extract_audio(video_path)
 
             # Transcribe
-            transcription = self.transcribe(audio_path, language)
+            transcription = self.transcribe(audio_path, language, quality)
             transcription['audio_path'] = audio_path
 
             return transcription
@@ -575,6 +1399,50 @@ class WhisperTranscriber:
             if unload_after and not self.use_groq:
                 self.unload_model()
 
+    @staticmethod
+    def _range_bounds(items: List[Dict[str, Any]]) -> tuple:
+        """
+        Bisect arrays for finding the items that touch [start, end]
+        - max_ends: running max of the ends (always non-decreasing), so
+          bisect_left(max_ends, start) is the first item that can end after
+          start even when segments nest/overlap or word ends aren't monotonic
+        - starts: item starts, or None when they aren't sorted (the upper
+          bound then falls back to len(items) and the caller's check filters)
+        Times are packed in array('d') (8 bytes each instead of a float object
+        plus list slot)
+        """
+        starts = array('d', [it.get('start', 0) for it in items])
+        max_ends = array('d')
+        running = float('-inf')
+        for it in items:
+            end = it.get('end', 0)
+            if end > running:
+                running = end
+            max_ends.append(running)
+        if any(a > b for a, b in zip(starts, starts[1:])):
+            starts = None
+        return max_ends, starts
+
+    def _get_timerange_index(self, transcription: Dict[str, Any]) -> tuple:
+        """
+        Build (or reuse) the bisect index of a transcription.
+        Cached for the last segments list seen, so querying many clips from the
+        same transcription builds the index only once; the word/segment dicts
+        themselves are left untouched.
+        """
+        segments = transcription.get('segments', [])
+        index = self._timerange_index
+        if index is not None and index[0] is segments:
+            return index
+
+        index = (
+            segments,
+            self._range_bounds(segments),
+            [self._range_bounds(s.get('words', [])) for s in segments]
+        )
+        self._timerange_index = index
+        return index
+
     def get_text_for_timerange(
         self,
         transcription: Dict[str, Any],
@@ -596,30 +1464,42 @@ class WhisperTranscriber:
         words = []
         text_parts = []
 
-        for segment in transcription.get('segments', []):
+        all_segments, (seg_max_ends, seg_starts), word_bounds = self._get_timerange_index(transcription)
+
+        # Only candidate segments: from the first one that can end at/after
+        # start up to the last one starting at/before end
+        lo = bisect_left(seg_max_ends, start_time)
+        hi = bisect_right(seg_starts, end_time) if seg_starts is not None else len(all_segments)
+
+        for i in range(lo, hi):
+            segment = all_segments[i]
             seg_start = segment.get('start', 0)
             seg_end = segment.get('end', 0)
 
-            # Check if segment overlaps with our range
-            if seg_end >= start_time and seg_start <= end_time:
-                # Filter words within range
-                segment_words = []
-                for word in segment.get('words', []):
-                    word_start = word.get('start', 0)
-                    word_end = word.get('end', 0)
-
-                    if word_end >= start_time and word_start <= end_time:
-                        segment_words.append(word)
-                        words.append(word)
-
-                if segment_words:
-                    text_parts.append(' '.join(w['word'] for w in segment_words))
-                    segments.append({
-                        'start': max(seg_start, start_time),
-                        'end': min(seg_end, end_time),
-                        'text': ' '.join(w['word'] for w in segment_words),
-                        'words': segment_words
-                    })
+            # Candidates only bound the scan: each one still has to overlap the range
+            if seg_end < start_time or seg_start > end_time:
+                continue
+
+            # Same bisect over the segment's words, then the same overlap check
+            all_words = segment.get('words', [])
+            word_max_ends, word_starts = word_bounds[i]
+            w_lo = bisect_left(word_max_ends, start_time)
+            w_hi = bisect_right(word_starts, end_time) if word_starts is not None else len(all_words)
+            segment_words = [
+                w for w in all_words[w_lo:w_hi]
+                if w.get('end', 0) >= start_time and w.get('start', 0) <= end_time
+            ]
+            words.extend(segment_words)
+
+            if segment_words:
+                segment_text = ' '.join(w['word'] for w in segment_words)
+                text_parts.append(segment_text)
+                segments.append({
+                    'start': max(seg_start, start_time),
+                    'end': min(seg_end, end_time),
+                    'text': segment_text,
+                    'words': segment_words
+                })
 
         return {
             'text': ' '.join(text_parts),
@@ -6,13 +6,23 @@ Suporta múltiplos backends para timestamps precisos:
 - faster-whisper: Rápido com timestamps nativos
 - Groq API: Cloud API (fallback)
 """
+import gc
 import json
+import os
+import random
 import subprocess
+import tempfile
+import threading
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Literal
+from typing import Dict, Any, Iterator, List, Optional, Literal
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import httpx
+
 from config import (
     AUDIO_DIR,
     WHISPER_MODEL,
@@ -20,6 +30,11 @@ from config import (
     GROQ_API_KEY
 )
 
+# Orçamento de RPM do Groq e backoff compartilhados com o WhisperTranscriber
+# (mesma API key: um único token bucket por processo)
+from .transcriber import _groq_bucket, _retry_delay
+from . import transcript_cache
+
 # Importar novas API keys (com fallback para evitar erro se não existirem)
 try:
     from config import DEEPGRAM_API_KEY, ASSEMBLYAI_API_KEY
@@ -28,8 +43,112 @@ except ImportError:
     ASSEMBLYAI_API_KEY = ""
 
 
+# orjson faz o parse de respostas grandes (palavra a palavra) ~2-4x mais rápido
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP/2 nos clientes das APIs cloud precisa do pacote opcional h2 (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Chunks temporários em RAM (tmpfs) quando disponível: sem round-trip de disco
+CHUNK_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Extensão -> MIME type dos uploads para as APIs cloud
+AUDIO_MIME_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.m4a': 'audio/mp4',
+    '.ogg': 'audio/ogg',
+    '.flac': 'audio/flac',
+}
+
+
 # Tipos de backend suportados
-TranscriptionBackend = Literal["deepgram", "assemblyai", "whisperx", "stable-ts", "faster-whisper", "groq", "auto"]
+TranscriptionBackend = Literal["deepgram", "assemblyai", "whisperx", "stable-ts", "faster-whisper", "groq", "race", "auto"]
+
+
+@lru_cache(maxsize=256)
+def _probe_duration_cached(path_str: str, mtime: float, size: int) -> float:
+    """Duração via ffprobe; mtime/size na chave invalidam o cache se o arquivo mudar."""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        path_str
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return float(result.stdout.strip())
+
+
+def probe_duration(audio_path) -> float:
+    """
+    Retorna a duração do áudio em segundos.
+
+    Cacheado por (caminho, mtime, tamanho): o mesmo arquivo transcrito de novo
+    (retry, outro backend) não dispara outro ffprobe.
+    """
+    path = Path(audio_path).resolve()
+    stat = path.stat()
+    return _probe_duration_cached(str(path), stat.st_mtime, stat.st_size)
+
+
+@lru_cache(maxsize=None)
+def _get_torch():
+    """
+    Retorna o módulo torch, ou None se não estiver instalado.
+
+    Import adiado (torch custa segundos e não é usado pelos backends cloud),
+    mas feito uma vez só: chamadas seguintes não passam pelo import de novo.
+    """
+    try:
+        import torch
+        return torch
+    except ImportError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _backend_available(backend: str) -> bool:
+    """
+    Verifica se um backend está disponível.
+
+    Memoizado: os probes de import (whisperx, stable_whisper...) custam
+    segundos e o resultado não muda durante o processo.
+    """
+    try:
+        if backend == "deepgram":
+            return bool(DEEPGRAM_API_KEY)
+        elif backend == "assemblyai":
+            return bool(ASSEMBLYAI_API_KEY)
+        elif backend == "whisperx":
+            import whisperx
+            # Testar import completo
+            _ = whisperx.load_model
+            return True
+        elif backend == "stable-ts":
+            import stable_whisper
+            # Testar import completo
+            _ = stable_whisper.load_model
+            return True
+        elif backend == "faster-whisper":
+            from faster_whisper import WhisperModel
+            return True
+        elif backend == "groq":
+            return bool(GROQ_API_KEY)
+        elif backend == "groq-enhanced":
+            # Groq com pós-processamento de timestamps
+            return bool(GROQ_API_KEY)
+    except (ImportError, AttributeError, Exception):
+        pass
+    return False
 
 
 class TranscriberV2:
@@ -41,6 +160,8 @@ class TranscriberV2:
     - stable-ts: Timestamps estabilizados, bom equilíbrio
     - faster-whisper: Rápido, timestamps nativos
     - groq: API cloud, rápido mas menos preciso
+    - race: Dispara todos os backends cloud configurados e usa o primeiro que responder
+      (os perdedores também são cobrados pelo que já foi enviado, ver _transcribe_race)
     - auto: Seleciona automaticamente o melhor disponível
 
     Ordem de prioridade (auto): whisperx > stable-ts > faster-whisper > groq
@@ -48,6 +169,44 @@ class TranscriberV2:
 
     GROQ_API_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
     GROQ_MODEL = "whisper-large-v3-turbo"
+    GROQ_MAX_RETRIES = 3
+    GROQ_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})  # Transitórios: tentar de novo
+
+    # Tempo máximo aguardando um job do AssemblyAI (evita loop infinito em job travado)
+    ASSEMBLYAI_POLL_TIMEOUT = 600.0
+
+    # Backend -> método de transcrição (dispatch em transcribe())
+    TRANSCRIBE_METHODS = {
+        "deepgram": "_transcribe_deepgram",
+        "assemblyai": "_transcribe_assemblyai",
+        "whisperx": "_transcribe_whisperx",
+        "stable-ts": "_transcribe_stable_ts",
+        "faster-whisper": "_transcribe_faster_whisper",
+        "groq": "_transcribe_groq",
+        "race": "_transcribe_race",
+    }
+
+    # Backend -> aplicar _enhance_timestamps por padrão? Quem já entrega timing
+    # por palavra preciso (alinhamento forçado, APIs com word timestamps) não
+    # passa pela heurística, que inventaria os 80ms mínimos e moveria fronteiras
+    NEEDS_ENHANCE = {
+        "whisperx": False,
+        "stable-ts": False,
+        "faster-whisper": True,
+        "groq": True,
+        "deepgram": False,
+        "assemblyai": False,
+    }
+
+    # Backends cloud que aceitam o áudio como stream (transcribe_video com stream_upload)
+    STREAM_UPLOAD_BACKENDS = ("deepgram", "assemblyai")
+
+    # Backends que entram no modo race (só cloud: os locais disputariam CPU/GIL)
+    RACE_BACKENDS = ("deepgram", "assemblyai", "groq")
+
+    # Backends do race que recebem o evento de parada (Deepgram é um único
+    # POST síncrono: não há passo intermediário onde interromper)
+    RACE_STOPPABLE = ("assemblyai", "groq")
 
     def __init__(
         self,
@@ -74,13 +233,41 @@ class TranscriberV2:
         self.backend = self._resolve_backend(backend)
         self._model = None
         self._whisperx_model = None
-        self._align_model = None
+        self._align_model = {}  # idioma -> (model_a, metadata)
+        self._timerange_index = None  # Índice (bisect) da última transcrição consultada
+
+        # Cliente HTTP persistente para backends cloud: reaproveita conexões
+        # TLS (keep-alive) entre chunks/polls em vez de um handshake por request
+        self._http = None
+        if self.backend in ("groq", "deepgram", "assemblyai", "race"):
+            self._http = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(300.0, connect=10.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
 
         print(f"TranscriberV2: Usando backend '{self.backend}' com modelo '{self.model_size}'")
 
+    def close(self):
+        """Fecha o cliente HTTP persistente."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _resolve_backend(self, backend: TranscriptionBackend) -> str:
         """Resolve o backend a usar baseado na disponibilidade."""
-        if backend != "auto":
+        if backend == "race":
+            # Race precisa de pelo menos um backend cloud configurado
+            if any(self._check_backend_available(b) for b in self.RACE_BACKENDS):
+                return backend
+            print("Nenhum backend cloud para 'race', usando auto...")
+        elif backend != "auto":
             # Verificar se o backend solicitado está disponível
             if self._check_backend_available(backend):
                 return backend
@@ -97,45 +284,17 @@ class TranscriberV2:
         raise RuntimeError("Nenhum backend de transcrição disponível!")
 
     def _check_backend_available(self, backend: str) -> bool:
-        """Verifica se um backend está disponível."""
-        try:
-            if backend == "deepgram":
-                return bool(DEEPGRAM_API_KEY)
-            elif backend == "assemblyai":
-                return bool(ASSEMBLYAI_API_KEY)
-            elif backend == "whisperx":
-                import whisperx
-                # Testar import completo
-                _ = whisperx.load_model
-                return True
-            elif backend == "stable-ts":
-                import stable_whisper
-                # Testar import completo
-                _ = stable_whisper.load_model
-                return True
-            elif backend == "faster-whisper":
-                from faster_whisper import WhisperModel
-                return True
-            elif backend == "groq":
-                return bool(GROQ_API_KEY)
-            elif backend == "groq-enhanced":
-                # Groq com pós-processamento de timestamps
-                return bool(GROQ_API_KEY)
-        except (ImportError, AttributeError, Exception):
-            pass
-        return False
+        """Verifica se um backend está disponível (resultado memoizado)."""
+        return _backend_available(backend)
 
     def _get_device(self) -> str:
         """Detecta o dispositivo a usar."""
         if self.device != "auto":
             return self.device
 
-        try:
-            import torch
-            if torch.cuda.is_available():
-                return "cuda"
-        except ImportError:
-            pass
+        torch = _get_torch()
+        if torch is not None and torch.cuda.is_available():
+            return "cuda"
         return "cpu"
 
     def _get_compute_type(self, device: str) -> str:
@@ -144,6 +303,14 @@ class TranscriberV2:
             return self.compute_type
 
         if device == "cuda":
+            # int8_float16: pesos INT8 (metade da VRAM/banda) com ativações FP16,
+            # mais rápido que float16 puro em Turing/Ampere; GPUs sem INT8 ficam em float16
+            try:
+                import ctranslate2
+                if "int8_float16" in ctranslate2.get_supported_compute_types("cuda"):
+                    return "int8_float16"
+            except Exception:
+                pass
             return "float16"
         return "int8"
 
@@ -168,7 +335,10 @@ class TranscriberV2:
         return self._whisperx_model
 
     def _load_whisperx_align_model(self, language: str):
-        """Carrega modelo de alinhamento do WhisperX."""
+        """Carrega modelo de alinhamento do WhisperX (cacheado por idioma)."""
+        if language in self._align_model:
+            return self._align_model[language]
+
         import whisperx
 
         device = self._get_device()
@@ -179,8 +349,25 @@ class TranscriberV2:
             language_code=language,
             device=device
         )
+        self._align_model[language] = (model_a, metadata)
         return model_a, metadata
 
+    def unload_align_model(self, language: str = None):
+        """
+        Libera modelo(s) de alinhamento cacheados (útil com pouca VRAM).
+
+        Args:
+            language: Idioma a liberar (None = todos)
+        """
+        if language is None:
+            self._align_model.clear()
+        else:
+            self._align_model.pop(language, None)
+
+        torch = _get_torch()
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
     def _transcribe_whisperx(self, audio_path: str, language: str = None) -> Dict[str, Any]:
         """
         Transcreve usando WhisperX com forced alignment.
@@ -225,33 +412,33 @@ class TranscriberV2:
         """Formata resultado do WhisperX para o formato padrão."""
         segments = []
         all_words = []
-        full_text = []
 
-        for segment in result.get("segments", []):
-            segment_data = {
-                "id": len(segments),
-                "start": segment.get("start", 0),
-                "end": segment.get("end", 0),
-                "text": segment.get("text", "").strip(),
-                "words": []
-            }
+        for i, segment in enumerate(result.get("segments", [])):
+            seg_start = segment.get("start", 0)
+            seg_end = segment.get("end", 0)
 
-            # Processar palavras com timestamps
-            for word in segment.get("words", []):
-                word_data = {
+            # Processar palavras com timestamps (comprehension + extend, sem append por palavra)
+            words = [
+                {
                     "word": word.get("word", "").strip(),
-                    "start": word.get("start", segment_data["start"]),
-                    "end": word.get("end", segment_data["end"]),
+                    "start": word.get("start", seg_start),
+                    "end": word.get("end", seg_end),
                     "probability": word.get("score", 1.0)
                 }
-                segment_data["words"].append(word_data)
-                all_words.append(word_data)
+                for word in segment.get("words", [])
+            ]
+            all_words.extend(words)
 
-            segments.append(segment_data)
-            full_text.append(segment_data["text"])
+            segments.append({
+                "id": i,
+                "start": seg_start,
+                "end": seg_end,
+                "text": segment.get("text", "").strip(),
+                "words": words
+            })
 
         return {
-            "text": " ".join(full_text),
+            "text": " ".join(s["text"] for s in segments),
             "language": language,
             "duration": segments[-1]["end"] if segments else 0,
             "segments": segments,
@@ -297,33 +484,30 @@ class TranscriberV2:
         """Formata resultado do stable-ts para o formato padrão."""
         segments = []
         all_words = []
-        full_text = []
 
         for i, segment in enumerate(result.segments):
-            segment_data = {
-                "id": i,
-                "start": segment.start,
-                "end": segment.end,
-                "text": segment.text.strip(),
-                "words": []
-            }
-
             # Processar palavras
-            for word in segment.words:
-                word_data = {
+            words = [
+                {
                     "word": word.word.strip(),
                     "start": word.start,
                     "end": word.end,
                     "probability": getattr(word, "probability", 1.0)
                 }
-                segment_data["words"].append(word_data)
-                all_words.append(word_data)
+                for word in segment.words
+            ]
+            all_words.extend(words)
 
-            segments.append(segment_data)
-            full_text.append(segment_data["text"])
+            segments.append({
+                "id": i,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text.strip(),
+                "words": words
+            })
 
         return {
-            "text": " ".join(full_text),
+            "text": " ".join(s["text"] for s in segments),
             "language": language,
             "duration": segments[-1]["end"] if segments else 0,
             "segments": segments,
@@ -351,16 +535,12 @@ class TranscriberV2:
             )
         return self._model
 
-    def _transcribe_faster_whisper(self, audio_path: str, language: str = None) -> Dict[str, Any]:
-        """
-        Transcreve usando faster-whisper com timestamps nativos.
-
-        faster-whisper é 4x mais rápido que o Whisper original e usa menos memória.
-        """
+    def _faster_whisper_segments(self, audio_path: str, language: str = None):
+        """Inicia a transcrição faster-whisper: retorna (gerador de segmentos, info)."""
         model = self._load_faster_whisper()
 
-        # Transcrever com word timestamps
-        segments_gen, info = model.transcribe(
+        # Transcrever com word timestamps (decodificação lazy, segmento a segmento)
+        return model.transcribe(
             audio_path,
             language=language,
             word_timestamps=True,
@@ -371,41 +551,76 @@ class TranscriberV2:
             )
         )
 
+    def _transcribe_faster_whisper(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+        """
+        Transcreve usando faster-whisper com timestamps nativos.
+
+        faster-whisper é 4x mais rápido que o Whisper original e usa menos memória.
+        """
+        segments_gen, info = self._faster_whisper_segments(audio_path, language)
+
         # Formatar resultado
         return self._format_faster_whisper_result(segments_gen, info)
 
-    def _format_faster_whisper_result(self, segments_gen, info) -> Dict[str, Any]:
-        """Formata resultado do faster-whisper para o formato padrão."""
-        segments = []
-        all_words = []
-        full_text = []
+    def transcribe_stream(self, audio_path: str, language: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Transcreve com faster-whisper emitindo cada segmento (com palavras)
+        assim que é decodificado, sem materializar a transcrição inteira.
 
+        Útil para gravar em disco / enviar por websocket progressivamente.
+        Só suportado pelo backend faster-whisper (os demais retornam tudo de uma vez).
+
+        Yields:
+            Dicts de segmento no formato padrão (id, start, end, text, words)
+        """
+        if self.backend != "faster-whisper":
+            raise ValueError(f"Streaming não suportado pelo backend: {self.backend}")
+
+        if language == "auto":
+            language = None
+        elif language is None:
+            language = WHISPER_LANGUAGE
+
+        segments_gen, _ = self._faster_whisper_segments(audio_path, language)
+        yield from self._iter_faster_whisper_segments(segments_gen)
+
+    def _iter_faster_whisper_segments(self, segments_gen) -> Iterator[Dict[str, Any]]:
+        """
+        Converte segmentos do faster-whisper para o formato padrão, um a um.
+
+        Cada objeto Segment (e suas Word) é descartado assim que convertido.
+        """
         for i, segment in enumerate(segments_gen):
-            segment_data = {
+            # Processar palavras
+            words = [
+                {
+                    "word": word.word.strip(),
+                    "start": word.start,
+                    "end": word.end,
+                    "probability": word.probability
+                }
+                for word in (segment.words or [])
+            ]
+
+            yield {
                 "id": i,
                 "start": segment.start,
                 "end": segment.end,
                 "text": segment.text.strip(),
-                "words": []
+                "words": words
             }
 
-            # Processar palavras
-            if segment.words:
-                for word in segment.words:
-                    word_data = {
-                        "word": word.word.strip(),
-                        "start": word.start,
-                        "end": word.end,
-                        "probability": word.probability
-                    }
-                    segment_data["words"].append(word_data)
-                    all_words.append(word_data)
+    def _format_faster_whisper_result(self, segments_gen, info) -> Dict[str, Any]:
+        """Formata resultado do faster-whisper para o formato padrão."""
+        segments = []
+        all_words = []
 
-            segments.append(segment_data)
-            full_text.append(segment_data["text"])
+        for segment in self._iter_faster_whisper_segments(segments_gen):
+            all_words.extend(segment["words"])
+            segments.append(segment)
 
         return {
-            "text": " ".join(full_text),
+            "text": " ".join(s["text"] for s in segments),
             "language": info.language,
             "duration": segments[-1]["end"] if segments else 0,
             "segments": segments,
@@ -417,185 +632,365 @@ class TranscriberV2:
     # Groq API Backend - Cloud API (fallback)
     # =========================================================================
 
-    def _transcribe_groq(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+    def _transcribe_groq(
+        self,
+        audio_path: str,
+        language: str = None,
+        stop: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
         """
         Transcreve usando Groq API (cloud).
 
         Rápido mas com timestamps menos precisos que backends locais.
+        stop: evento do race; quando setado, nenhum novo upload é feito.
         """
-        import httpx
-
         # Verificar tamanho do arquivo
         file_size = Path(audio_path).stat().st_size
         max_size = 25 * 1024 * 1024  # 25MB
 
         if file_size > max_size:
-            return self._transcribe_groq_chunked(audio_path, language)
-
-        return self._groq_request(audio_path, language)
-
-    def _groq_request_raw(self, audio_path: str, language: str = None) -> Dict[str, Any]:
-        """Faz request para Groq API e retorna JSON raw."""
-        import httpx
+            # Duração obtida uma vez e repassada ao caminho com chunks
+            duration = probe_duration(audio_path)
+
+            # Opus 24kbps mono (inteligível para fala) cabe ~2h20 em 25MB: um
+            # único upload em vez de N chunks. Só tenta se a estimativa couber
+            opus_bitrate = 24000
+            if duration * opus_bitrate / 8 < max_size * 0.95:
+                with tempfile.TemporaryDirectory(prefix='groq_opus_', dir=CHUNK_TMP_DIR) as tmp_dir:
+                    opus_path = Path(tmp_dir) / f"{Path(audio_path).stem}.ogg"
+                    if not self._transcode_opus(audio_path, opus_path, '24k'):
+                        print("  Conversão para Opus falhou, usando chunks")
+                    else:
+                        if opus_path.stat().st_size <= max_size:
+                            print(f"  Áudio convertido para Opus ({opus_path.stat().st_size / 1024 / 1024:.1f}MB), sem chunks")
+                            return self._groq_request(str(opus_path), language, stop)
+
+            return self._transcribe_groq_chunked(audio_path, language, duration, stop)
+
+        return self._groq_request(audio_path, language, stop)
+
+    def _transcode_opus(self, audio_path: str, output_path: Path, bitrate: str) -> bool:
+        """
+        Converte o áudio para Opus mono 16kHz (perfil voz).
 
-        mime_type = self._get_audio_mime_type(audio_path)
+        Returns:
+            True se converteu; False se o ffmpeg falhou (ex: build sem libopus)
+        """
+        cmd = [
+            'ffmpeg', '-y',
+            '-i', str(audio_path),
+            '-map', '0:a:0',
+            '-c:a', 'libopus',
+            '-b:a', bitrate,
+            '-application', 'voip',
+            '-ac', '1',
+            '-ar', '16000',
+            str(output_path)
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+            return True
+        except subprocess.CalledProcessError:
+            return False
 
-        with open(audio_path, 'rb') as audio_file:
-            files = {'file': (Path(audio_path).name, audio_file, mime_type)}
-            data = {
-                'model': self.GROQ_MODEL,
-                'response_format': 'verbose_json',
-                'timestamp_granularities[]': 'word',
-            }
-            if language:
-                data['language'] = language
-
-            response = httpx.post(
-                self.GROQ_API_URL,
-                files=files,
-                data=data,
-                headers={'Authorization': f'Bearer {GROQ_API_KEY}'},
-                timeout=120.0
-            )
+    def _groq_request_raw(
+        self,
+        audio_path: str,
+        language: str = None,
+        stop: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Faz request para Groq API e retorna JSON raw.
 
-            if response.status_code != 200:
-                raise Exception(f"Groq API error: {response.status_code} - {response.text}")
+        Ritmo pelo token bucket de GROQ_RPM (compartilhado com o V1) e até
+        GROQ_MAX_RETRIES novas tentativas com backoff exponencial (ou o
+        Retry-After do servidor) para 429/5xx, timeouts e erros de rede.
+        Esgotadas as tentativas, levanta exceção. Com stop setado (race já
+        decidido), levanta antes de cada tentativa em vez de enviar o áudio.
+        """
+        http = self._http or httpx  # Cliente persistente quando disponível
 
-            return response.json()
+        mime_type = self._get_audio_mime_type(audio_path)
+        data = {
+            'model': self.GROQ_MODEL,
+            'response_format': 'verbose_json',
+            'timestamp_granularities[]': 'word',
+        }
+        if language:
+            data['language'] = language
 
-    def _groq_request(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+        max_retries = self.GROQ_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            try:
+                # Reabre o arquivo a cada tentativa: o multipart é enviado em stream
+                with open(audio_path, 'rb') as audio_file:
+                    files = {'file': (Path(audio_path).name, audio_file, mime_type)}
+                    _groq_bucket.acquire()
+                    self._raise_if_stopped(stop, "Groq")
+                    response = http.post(
+                        self.GROQ_API_URL,
+                        files=files,
+                        data=data,
+                        headers={'Authorization': f'Bearer {GROQ_API_KEY}'},
+                        timeout=120.0
+                    )
+            except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
+                if attempt < max_retries:
+                    delay = _retry_delay(attempt, 1.0)
+                    print(f"  Groq: {type(e).__name__}, nova tentativa em {delay:.1f}s...")
+                    self._sleep_unless_stopped(delay, stop)
+                    continue
+                raise Exception(f"Groq API falhou após {max_retries + 1} tentativas: {e}") from e
+
+            if response.status_code == 200:
+                return self._parse_json(response)
+
+            if response.status_code == 429:
+                _groq_bucket.throttle()
+            if response.status_code in self.GROQ_RETRY_STATUSES and attempt < max_retries:
+                delay = _retry_delay(attempt, 1.0, response.headers.get('Retry-After'))
+                print(f"  Groq retornou {response.status_code}, nova tentativa em {delay:.1f}s...")
+                self._sleep_unless_stopped(delay, stop)
+                continue
+
+            raise Exception(f"Groq API error: {response.status_code} - {response.text}")
+
+    def _groq_request(
+        self,
+        audio_path: str,
+        language: str = None,
+        stop: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
         """Faz request para Groq API e retorna resultado formatado."""
-        raw_result = self._groq_request_raw(audio_path, language)
+        raw_result = self._groq_request_raw(audio_path, language, stop)
         return self._format_groq_result(raw_result)
 
-    def _transcribe_groq_chunked(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+    def _transcribe_groq_chunked(
+        self,
+        audio_path: str,
+        language: str = None,
+        total_duration: Optional[float] = None,
+        stop: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
         """
         Transcreve arquivo grande em chunks via Groq.
 
-        Divide o áudio em chunks de 10 minutos, transcreve cada um,
-        e combina os resultados ajustando os timestamps.
+        Divide o áudio em chunks de 10 minutos numa única passada do ffmpeg,
+        transcreve até 4 em paralelo e combina os resultados (em ordem)
+        ajustando os timestamps. Se um chunk falhar mesmo após os retries,
+        levanta RuntimeError (sem transcrição com buracos). Com stop setado,
+        os workers param antes do próximo upload e o mesmo RuntimeError sobe.
         """
-        import tempfile
-        import os
-
         chunk_duration = 600  # 10 min
+        max_workers = 4  # Chunks simultâneos (limitado pelo rate limit do Groq)
         audio_path = Path(audio_path)
 
-        # Obter duração total
-        cmd = [
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(audio_path)
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        total_duration = float(result.stdout.strip())
+        # Obter duração total (se o chamador ainda não a tiver)
+        if total_duration is None:
+            total_duration = probe_duration(audio_path)
 
         print(f"  Áudio total: {total_duration:.1f}s, dividindo em chunks de {chunk_duration}s")
 
-        # Processar chunks e coletar resultados RAW
+        raw_results = {}
+        with tempfile.TemporaryDirectory(prefix='groq_chunks_', dir=CHUNK_TMP_DIR) as chunk_dir:
+            # Uma passada do ffmpeg gera todos os chunks (índice, início, fim, arquivo)
+            try:
+                chunks = self._pre_segment_audio(audio_path, chunk_duration, Path(chunk_dir))
+            except subprocess.CalledProcessError as e:
+                stderr = (e.stderr or b'').decode('utf-8', 'replace')[-200:].strip()
+                print(f"  Segmentação falhou, extraindo chunk a chunk: {stderr or e}")
+                # Fallback: enumerar chunks e extrair cada um no worker
+                chunks = []
+                current_time = 0
+                while current_time < total_duration:
+                    chunk_end = min(current_time + chunk_duration, total_duration)
+                    chunks.append((len(chunks) + 1, current_time, chunk_end, None))
+                    current_time = chunk_end
+
+            # Transcrever chunks em paralelo (I/O-bound: HTTPS)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._process_groq_chunk, idx, start, end, audio_path, language, chunk_path, stop
+                    ): idx
+                    for idx, start, end, chunk_path in chunks
+                }
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    try:
+                        raw_results[idx] = future.result()
+                    except Exception as e:
+                        # Chunk perdido (já com retries) = buraco na transcrição:
+                        # falhar em vez de devolver um resultado incompleto
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise RuntimeError(f"Groq: chunk {idx} falhou: {e}") from e
+
+        # Combinar resultados RAW na ordem dos chunks
         all_segments = []
         all_words = []
         full_text = []
         detected_language = language
+        # Só segmentos vindos do Groq precisam de associação de palavras;
+        # os criados por _create_segments_from_words já trazem as suas
+        unassigned_segments = []
+
+        for idx, current_time, _, _ in chunks:
+            raw_result = raw_results.get(idx)
+            if raw_result is None:
+                continue
+
+            # Detectar idioma do primeiro chunk
+            if detected_language is None and raw_result.get('language'):
+                detected_language = raw_result.get('language')
+
+            # Processar palavras com offset primeiro
+            # (verbose_json sempre traz word/start/end: subscript direto, sem .get() or 0)
+            chunk_words = [
+                {
+                    'word': word['word'].strip(),
+                    'start': word['start'] + current_time,
+                    'end': word['end'] + current_time,
+                    'probability': 1.0
+                }
+                for word in (raw_result.get('words') or [])
+            ]
+            all_words.extend(chunk_words)
+
+            # Processar segmentos com offset (se existirem)
+            raw_segments = raw_result.get('segments') or []
+            if raw_segments:
+                first_id = len(all_segments)
+                adjusted_segments = [
+                    {
+                        'id': first_id + i,
+                        'start': segment['start'] + current_time,
+                        'end': segment['end'] + current_time,
+                        'text': segment['text'].strip(),
+                        'words': []
+                    }
+                    for i, segment in enumerate(raw_segments)
+                ]
+                all_segments.extend(adjusted_segments)
+                unassigned_segments.extend(adjusted_segments)
+            else:
+                # Groq não retornou segmentos - criar a partir das palavras
+                chunk_segments = self._create_segments_from_words(chunk_words)
+                for seg in chunk_segments:
+                    seg['id'] = len(all_segments)
+                    all_segments.append(seg)
+
+            # Adicionar texto
+            if raw_result.get('text'):
+                full_text.append(raw_result.get('text').strip())
 
-        current_time = 0
-        chunk_num = 0
+        # Associar palavras aos segmentos
+        self._assign_words_to_segments(unassigned_segments, all_words)
 
-        while current_time < total_duration:
-            chunk_num += 1
-            chunk_end = min(current_time + chunk_duration, total_duration)
+        print(f"  Transcrição combinada: {len(all_segments)} segmentos, {len(all_words)} palavras")
 
-            # Extrair chunk como MP3
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp:
-                chunk_path = tmp.name
+        return {
+            'text': ' '.join(full_text),
+            'language': detected_language or 'pt',
+            'duration': total_duration,
+            'segments': all_segments,
+            'words': all_words,
+            'backend': 'groq'
+        }
 
-            try:
-                cmd = [
-                    'ffmpeg', '-y',
-                    '-ss', str(current_time),
-                    '-i', str(audio_path),
-                    '-t', str(chunk_end - current_time),
-                    '-acodec', 'libmp3lame',
-                    '-b:a', '64k',
-                    '-ar', '16000',
-                    '-ac', '1',
-                    chunk_path
-                ]
-                subprocess.run(cmd, check=True, capture_output=True)
+    def _pre_segment_audio(
+        self,
+        audio_path: Path,
+        chunk_duration: float,
+        out_dir: Path
+    ) -> List[tuple]:
+        """
+        Divide o áudio em chunks MP3 com uma única passada do ffmpeg (segment muxer).
 
-                print(f"  Transcrevendo chunk {chunk_num} ({current_time:.0f}s - {chunk_end:.0f}s)...")
+        MP3 de origem é copiado sem re-encode; outros formatos (ex: WAV do
+        extract_audio) são codificados uma vez só, em vez de um LAME por chunk.
 
-                # Transcrever chunk - pegar resultado RAW
-                raw_result = self._groq_request_raw(chunk_path, language)
+        Returns:
+            Lista de (índice, início, fim, caminho) com os tempos reais de corte
 
-                # Detectar idioma do primeiro chunk
-                if detected_language is None and raw_result.get('language'):
-                    detected_language = raw_result.get('language')
+        Raises:
+            subprocess.CalledProcessError se o ffmpeg falhar
+        """
+        if audio_path.suffix.lower() == '.mp3':
+            codec_args = ['-c:a', 'copy']
+        else:
+            codec_args = ['-acodec', 'libmp3lame', '-b:a', '64k', '-ar', '16000', '-ac', '1']
 
-                # Processar palavras com offset primeiro
-                chunk_words = []
-                for word in (raw_result.get('words') or []):
-                    adjusted_word = {
-                        'word': (word.get('word') or '').strip(),
-                        'start': (word.get('start') or 0) + current_time,
-                        'end': (word.get('end') or 0) + current_time,
-                        'probability': 1.0
-                    }
-                    chunk_words.append(adjusted_word)
-                    all_words.append(adjusted_word)
-
-                # Processar segmentos com offset (se existirem)
-                raw_segments = raw_result.get('segments') or []
-                if raw_segments:
-                    for segment in raw_segments:
-                        adjusted_segment = {
-                            'id': len(all_segments),
-                            'start': (segment.get('start') or 0) + current_time,
-                            'end': (segment.get('end') or 0) + current_time,
-                            'text': (segment.get('text') or '').strip(),
-                            'words': []
-                        }
-                        all_segments.append(adjusted_segment)
-                else:
-                    # Groq não retornou segmentos - criar a partir das palavras
-                    chunk_segments = self._create_segments_from_words(chunk_words)
-                    for seg in chunk_segments:
-                        seg['id'] = len(all_segments)
-                        all_segments.append(seg)
+        list_path = out_dir / 'chunks.csv'
+        cmd = [
+            'ffmpeg', '-y',
+            '-i', str(audio_path),
+            '-map', '0:a:0',
+            *codec_args,
+            '-f', 'segment',
+            '-segment_time', str(chunk_duration),
+            '-segment_format', 'mp3',
+            '-segment_list', str(list_path),
+            '-segment_list_type', 'csv',
+            '-reset_timestamps', '1',
+            str(out_dir / 'chunk_%03d.mp3')
+        ]
+        subprocess.run(cmd, check=True, capture_output=True)
 
-                # Adicionar texto
-                if raw_result.get('text'):
-                    full_text.append(raw_result.get('text').strip())
+        # Cada linha: arquivo,início,fim
+        chunks = []
+        for line in list_path.read_text().splitlines():
+            if not line.strip():
+                continue
+            name, start, end = line.rsplit(',', 2)
+            chunks.append((len(chunks) + 1, float(start), float(end), out_dir / name))
+        return chunks
 
-            except Exception as e:
-                print(f"  Erro no chunk {chunk_num}: {e}")
-                # Continuar com próximo chunk
-            finally:
-                if os.path.exists(chunk_path):
-                    os.unlink(chunk_path)
+    def _process_groq_chunk(
+        self,
+        chunk_idx: int,
+        start: float,
+        end: float,
+        audio_path: Path,
+        language: str = None,
+        chunk_path: Optional[Path] = None,
+        stop: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Transcreve um chunk e retorna o resultado RAW do Groq (roda em thread).
 
-            current_time = chunk_end
+        Usa o arquivo já gerado por _pre_segment_audio quando existir;
+        senão extrai o chunk como MP3.
+        """
+        self._raise_if_stopped(stop, "Groq")
+        if chunk_path is not None:
+            print(f"  Transcrevendo chunk {chunk_idx} ({start:.0f}s - {end:.0f}s)...")
+            return self._groq_request_raw(str(chunk_path), language, stop)
 
-        # Associar palavras aos segmentos
-        for segment in all_segments:
-            seg_start = segment['start']
-            seg_end = segment['end']
-            segment['words'] = [
-                w for w in all_words
-                if w['start'] >= seg_start - 0.1 and w['end'] <= seg_end + 0.1
+        # Extrair chunk como MP3
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False, dir=CHUNK_TMP_DIR) as tmp:
+            chunk_path = tmp.name
+
+        try:
+            cmd = [
+                'ffmpeg', '-y',
+                '-ss', str(start),
+                '-i', str(audio_path),
+                '-t', str(end - start),
+                '-acodec', 'libmp3lame',
+                '-b:a', '64k',
+                '-ar', '16000',
+                '-ac', '1',
+                chunk_path
             ]
+            subprocess.run(cmd, check=True, capture_output=True)
 
-        print(f"  Transcrição combinada: {len(all_segments)} segmentos, {len(all_words)} palavras")
+            print(f"  Transcrevendo chunk {chunk_idx} ({start:.0f}s - {end:.0f}s)...")
 
-        return {
-            'text': ' '.join(full_text),
-            'language': detected_language or 'pt',
-            'duration': total_duration,
-            'segments': all_segments,
-            'words': all_words,
-            'backend': 'groq'
-        }
+            # Transcrever chunk - pegar resultado RAW
+            return self._groq_request_raw(chunk_path, language, stop)
+        finally:
+            if os.path.exists(chunk_path):
+                os.unlink(chunk_path)
 
     def _create_segments_from_words(self, words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -642,8 +1037,9 @@ class TranscriberV2:
                     'start': current_segment_start,
                     'end': current_segment_words[-1]['end'],
                     'text': segment_text,
-                    'words': current_segment_words.copy()
+                    'words': current_segment_words
                 })
+                # Nova lista: o segmento fica com a anterior, sem precisar de cópia
                 current_segment_words = []
                 current_segment_start = word['start']
 
@@ -657,7 +1053,7 @@ class TranscriberV2:
                 'start': current_segment_start,
                 'end': current_segment_words[-1]['end'],
                 'text': segment_text,
-                'words': current_segment_words.copy()
+                'words': current_segment_words
             })
 
         return segments
@@ -703,11 +1099,7 @@ class TranscriberV2:
                 segments.append(segment_data)
 
             # Associar palavras aos segmentos
-            for segment in segments:
-                segment['words'] = [
-                    w for w in all_words
-                    if w['start'] >= segment['start'] - 0.1 and w['end'] <= segment['end'] + 0.1
-                ]
+            self._assign_words_to_segments(segments, all_words)
         else:
             # Groq não retornou segmentos - criar a partir das palavras
             segments = self._create_segments_from_words(all_words)
@@ -732,19 +1124,40 @@ class TranscriberV2:
 
         Deepgram oferece alta precisão e word-level timestamps confiáveis.
         Modelo Nova-3 é o mais preciso disponível.
+
+        Áudio sem compressão (WAV/FLAC) com mais de 5 minutos é enviado como
+        Opus 32kbps: upload ~15x menor, que dominava o tempo em arquivos longos.
         """
-        import httpx
+        with tempfile.TemporaryDirectory(prefix='deepgram_', dir=CHUNK_TMP_DIR) as tmp_dir:
+            upload_path = audio_path
+            stem, ext = os.path.splitext(os.path.basename(audio_path))
+            if ext.lower() in ('.wav', '.flac') and probe_duration(audio_path) > 300:
+                opus_path = Path(tmp_dir) / f"{stem}.ogg"
+                if self._transcode_opus(audio_path, opus_path, '32k'):
+                    upload_path = str(opus_path)
+                else:
+                    print("  Conversão para Opus falhou, enviando áudio original")
 
-        # Mapear código de idioma
-        lang_map = {"pt": "pt-BR", "en": "en-US", "es": "es"}
-        dg_language = lang_map.get(language, language) if language else "pt-BR"
+            return self._deepgram_request(upload_path, language)
 
-        # Ler arquivo de áudio
+    def _deepgram_request(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+        """Envia o arquivo de áudio ao Deepgram e retorna o resultado formatado."""
+        # Arquivo passado como stream: httpx envia em blocos de 64KB,
+        # sem carregar o áudio inteiro na memória
         with open(audio_path, 'rb') as audio_file:
-            audio_data = audio_file.read()
+            return self._deepgram_post(audio_file, self._get_audio_mime_type(audio_path), language)
 
-        # Detectar MIME type
-        mime_type = self._get_audio_mime_type(audio_path)
+    def _deepgram_post(self, content, mime_type: str, language: str = None) -> Dict[str, Any]:
+        """
+        POST do áudio ao Deepgram.
+
+        content: arquivo aberto ou iterável de bytes (ex: stdout do ffmpeg).
+        """
+        http = self._http or httpx  # Cliente persistente quando disponível
+
+        # Mapear código de idioma
+        lang_map = {"pt": "pt-BR", "en": "en-US", "es": "es"}
+        dg_language = lang_map.get(language, language) if language else "pt-BR"
 
         # Configurar request
         url = "https://api.deepgram.com/v1/listen"
@@ -765,26 +1178,22 @@ class TranscriberV2:
 
         print(f"  Enviando para Deepgram ({dg_language})...")
 
-        response = httpx.post(
+        response = http.post(
             url,
             params=params,
             headers=headers,
-            content=audio_data,
+            content=content,
             timeout=300.0
         )
 
         if response.status_code != 200:
             raise Exception(f"Deepgram API error: {response.status_code} - {response.text}")
 
-        result = response.json()
+        result = self._parse_json(response)
         return self._format_deepgram_result(result, language or "pt")
 
     def _format_deepgram_result(self, result: Dict[str, Any], language: str) -> Dict[str, Any]:
         """Formata resultado do Deepgram para o formato padrão."""
-        segments = []
-        all_words = []
-        full_text = []
-
         # Deepgram retorna em results.channels[0].alternatives[0]
         try:
             channel = result["results"]["channels"][0]
@@ -801,33 +1210,33 @@ class TranscriberV2:
             }
 
         # Processar palavras
-        for word_data in alternative.get("words", []):
-            word = {
+        all_words = [
+            {
                 'word': word_data.get('word', '').strip(),
                 'start': word_data.get('start', 0),
                 'end': word_data.get('end', 0),
                 'probability': word_data.get('confidence', 1.0)
             }
-            all_words.append(word)
+            for word_data in alternative.get("words", [])
+        ]
 
         # Usar utterances como segmentos (se disponíveis)
         utterances = result.get("results", {}).get("utterances", [])
         if utterances:
-            for i, utt in enumerate(utterances):
-                segment = {
+            segments = [
+                {
                     'id': i,
                     'start': utt.get('start', 0),
                     'end': utt.get('end', 0),
                     'text': utt.get('transcript', '').strip(),
                     'words': []
                 }
-                # Associar palavras ao segmento
-                segment['words'] = [
-                    w for w in all_words
-                    if w['start'] >= segment['start'] - 0.1 and w['end'] <= segment['end'] + 0.1
-                ]
-                segments.append(segment)
-                full_text.append(segment['text'])
+                for i, utt in enumerate(utterances)
+            ]
+            full_text = [segment['text'] for segment in segments]
+
+            # Associar palavras aos segmentos
+            self._assign_words_to_segments(segments, all_words)
         else:
             # Criar segmentos a partir das palavras
             segments = self._create_segments_from_words(all_words)
@@ -846,14 +1255,59 @@ class TranscriberV2:
     # AssemblyAI Backend - Alta qualidade alternativa
     # =========================================================================
 
-    def _transcribe_assemblyai(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+    def _transcribe_assemblyai(
+        self,
+        audio_path: str,
+        language: str = None,
+        stop: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
         """
         Transcreve usando AssemblyAI API.
 
         AssemblyAI oferece alta precisão e word-level timestamps.
+        stop: evento do race; quando setado, o job não é criado ou o polling para.
+        """
+        # Passo 1: Upload do arquivo
+        # Arquivo passado como stream (blocos de 64KB), sem audio_file.read()
+        with open(audio_path, 'rb') as audio_file:
+            upload_url = self._assemblyai_upload(audio_file)
+
+        return self._assemblyai_transcribe_url(upload_url, language, stop)
+
+    def _assemblyai_upload(self, content) -> str:
+        """
+        Upload do áudio ao AssemblyAI; retorna a upload_url.
+
+        content: arquivo aberto ou iterável de bytes (ex: stdout do ffmpeg).
+        """
+        http = self._http or httpx  # Cliente persistente quando disponível
+
+        print(f"  Fazendo upload para AssemblyAI...")
+        upload_response = http.post(
+            "https://api.assemblyai.com/v2/upload",
+            headers={"Authorization": ASSEMBLYAI_API_KEY},
+            content=content,
+            timeout=300.0
+        )
+
+        if upload_response.status_code != 200:
+            raise Exception(f"AssemblyAI upload error: {upload_response.status_code}")
+
+        return self._parse_json(upload_response)["upload_url"]
+
+    def _assemblyai_transcribe_url(
+        self,
+        upload_url: str,
+        language: str = None,
+        stop: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
         """
-        import httpx
-        import time as time_module
+        Cria a transcrição de um áudio já enviado e aguarda o resultado.
+
+        Com stop setado, levanta em vez de criar o job ou no próximo poll
+        (o job já criado continua no AssemblyAI e é cobrado).
+        """
+        http = self._http or httpx  # Cliente persistente quando disponível
 
         # Mapear código de idioma
         lang_map = {"pt": "pt", "en": "en", "es": "es"}
@@ -864,22 +1318,8 @@ class TranscriberV2:
             "Content-Type": "application/json",
         }
 
-        # Passo 1: Upload do arquivo
-        print(f"  Fazendo upload para AssemblyAI...")
-        with open(audio_path, 'rb') as audio_file:
-            upload_response = httpx.post(
-                "https://api.assemblyai.com/v2/upload",
-                headers={"Authorization": ASSEMBLYAI_API_KEY},
-                content=audio_file.read(),
-                timeout=300.0
-            )
-
-        if upload_response.status_code != 200:
-            raise Exception(f"AssemblyAI upload error: {upload_response.status_code}")
-
-        upload_url = upload_response.json()["upload_url"]
-
         # Passo 2: Criar transcrição
+        self._raise_if_stopped(stop, "AssemblyAI")
         print(f"  Iniciando transcrição ({aai_language})...")
         transcript_request = {
             "audio_url": upload_url,
@@ -888,7 +1328,7 @@ class TranscriberV2:
             "format_text": True,
         }
 
-        transcript_response = httpx.post(
+        transcript_response = http.post(
             "https://api.assemblyai.com/v2/transcript",
             headers=headers,
             json=transcript_request,
@@ -898,25 +1338,38 @@ class TranscriberV2:
         if transcript_response.status_code != 200:
             raise Exception(f"AssemblyAI transcript error: {transcript_response.status_code}")
 
-        transcript_id = transcript_response.json()["id"]
+        transcript_id = self._parse_json(transcript_response)["id"]
 
         # Passo 3: Aguardar conclusão
+        # Backoff exponencial (0.5s -> x1.5 -> máx 5s): clips curtos são detectados
+        # em < 1s e jobs longos fazem menos polls que um intervalo fixo de 3s.
+        # Jitter de até 25% evita que jobs paralelos consultem a API em sincronia.
         print(f"  Aguardando processamento...")
+        poll_interval = 0.5
+        deadline = time.monotonic() + self.ASSEMBLYAI_POLL_TIMEOUT
         while True:
-            status_response = httpx.get(
+            self._raise_if_stopped(stop, "AssemblyAI")
+            status_response = http.get(
                 f"https://api.assemblyai.com/v2/transcript/{transcript_id}",
                 headers=headers,
                 timeout=60.0
             )
 
-            status = status_response.json()
+            status = self._parse_json(status_response)
 
             if status["status"] == "completed":
                 return self._format_assemblyai_result(status, language or "pt")
             elif status["status"] == "error":
                 raise Exception(f"AssemblyAI error: {status.get('error', 'Unknown error')}")
 
-            time_module.sleep(3)  # Aguardar 3 segundos antes de verificar novamente
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"AssemblyAI: transcrição {transcript_id} não concluiu em "
+                    f"{self.ASSEMBLYAI_POLL_TIMEOUT:.0f}s (status: {status['status']})"
+                )
+
+            self._sleep_unless_stopped(poll_interval + random.uniform(0, 0.25 * poll_interval), stop)
+            poll_interval = min(5.0, poll_interval * 1.5)
 
     def _format_assemblyai_result(self, result: Dict[str, Any], language: str) -> Dict[str, Any]:
         """Formata resultado do AssemblyAI para o formato padrão."""
@@ -963,13 +1416,14 @@ class TranscriberV2:
         if not words:
             return result
 
-        enhanced_words = []
+        # Ajustes feitos in-place nos dicts de palavra: o resultado é do chamador
+        # e os segmentos são remontados no fim, sem um dict novo por palavra.
+        # A palavra anterior fica numa local (prev) em vez de uma lista auxiliar.
         min_word_duration = 0.08  # Duração mínima de 80ms
         max_gap = 0.15  # Gap máximo antes de considerar pausa
 
-        for i, word in enumerate(words):
-            w = word.copy()
-
+        prev = None
+        for w in words:
             # Garantir duração mínima
             duration = w['end'] - w['start']
             if duration < min_word_duration:
@@ -979,8 +1433,7 @@ class TranscriberV2:
                 w['end'] = center + min_word_duration / 2
 
             # Ajustar início para não sobrepor palavra anterior
-            if enhanced_words:
-                prev = enhanced_words[-1]
+            if prev is not None:
                 if w['start'] < prev['end']:
                     # Ajustar para meio do overlap
                     mid = (w['start'] + prev['end']) / 2
@@ -992,19 +1445,10 @@ class TranscriberV2:
                     prev['end'] += gap * 0.3
                     w['start'] -= gap * 0.3
 
-            enhanced_words.append(w)
-
-        # Atualizar resultado
-        result['words'] = enhanced_words
+            prev = w
 
         # Atualizar palavras nos segmentos também
-        for segment in result.get('segments', []):
-            seg_start = segment['start']
-            seg_end = segment['end']
-            segment['words'] = [
-                w for w in enhanced_words
-                if w['start'] >= seg_start - 0.1 and w['end'] <= seg_end + 0.1
-            ]
+        self._assign_words_to_segments(result.get('segments', []), words)
 
         result['backend'] = result.get('backend', 'unknown') + '-enhanced'
         return result
@@ -1013,17 +1457,46 @@ class TranscriberV2:
     # Métodos auxiliares
     # =========================================================================
 
+    def _assign_words_to_segments(
+        self,
+        segments: List[Dict[str, Any]],
+        words: List[Dict[str, Any]],
+        pad: float = 0.1
+    ) -> None:
+        """
+        Preenche segment['words'] com as palavras dentro de [início - pad, fim + pad].
+
+        Palavras ordenadas por início: cada segmento pula (bisect) para a primeira
+        candidata e para assim que passa do fim, em vez de varrer todas as
+        palavras por segmento (O(S·W)).
+        """
+        starts = [w['start'] for w in words]
+        if any(a > b for a, b in zip(starts, starts[1:])):
+            words = sorted(words, key=lambda w: w['start'])
+            starts = [w['start'] for w in words]
+
+        for segment in segments:
+            seg_start = segment['start'] - pad
+            seg_end = segment['end'] + pad
+            segment_words = []
+            for i in range(bisect_left(starts, seg_start), len(words)):
+                w = words[i]
+                if w['start'] > seg_end:
+                    break
+                if w['end'] <= seg_end:
+                    segment_words.append(w)
+            segment['words'] = segment_words
+
+    def _parse_json(self, response) -> Any:
+        """Parse do corpo JSON da resposta (orjson quando instalado)."""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
+
     def _get_audio_mime_type(self, audio_path: str) -> str:
         """Retorna MIME type baseado na extensão."""
-        ext = Path(audio_path).suffix.lower()
-        mime_types = {
-            '.mp3': 'audio/mpeg',
-            '.wav': 'audio/wav',
-            '.m4a': 'audio/mp4',
-            '.ogg': 'audio/ogg',
-            '.flac': 'audio/flac',
-        }
-        return mime_types.get(ext, 'audio/wav')
+        ext = os.path.splitext(audio_path)[1].lower()
+        return AUDIO_MIME_TYPES.get(ext, 'audio/wav')
 
     def extract_audio(self, video_path: str, output_path: str = None) -> str:
         """
@@ -1046,6 +1519,9 @@ class TranscriberV2:
         # Extrair como WAV 16kHz mono (melhor para Whisper)
         cmd = [
             'ffmpeg',
+            '-nostdin',
+            '-loglevel', 'error',  # stderr só com erros, não o progresso inteiro
+            '-threads', '0',  # Todos os cores para decode/resample
             '-i', str(video_path),
             '-vn',
             '-acodec', 'pcm_s16le',
@@ -1056,19 +1532,160 @@ class TranscriberV2:
         ]
 
         print(f"Extraindo áudio: {video_path} -> {output_path}")
-        subprocess.run(cmd, check=True, capture_output=True)
+        try:
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as e:
+            # Guardar só o começo do erro (a causa), não o log inteiro
+            e.stderr = e.stderr[:1024] if e.stderr else e.stderr
+            print(f"Erro ao extrair áudio: {e.stderr.decode(errors='replace') if e.stderr else e}")
+            raise
 
         return str(output_path)
 
+    def extract_audio_stream(self, video_path: str) -> subprocess.Popen:
+        """
+        Extrai áudio do vídeo direto para um pipe (WAV 16kHz mono em stdout).
+
+        Evita gravar e reler o WAV inteiro no disco quando o áudio só vai ser
+        enviado para uma API. Quem chama lê proc.stdout e faz proc.wait().
+        """
+        cmd = [
+            'ffmpeg',
+            '-nostdin',
+            '-loglevel', 'error',
+            '-threads', '0',
+            '-i', str(video_path),
+            '-vn',
+            '-acodec', 'pcm_s16le',
+            '-ar', '16000',
+            '-ac', '1',
+            '-f', 'wav',
+            'pipe:1'
+        ]
+
+        print(f"Extraindo áudio (pipe): {video_path}")
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    # =========================================================================
+    # Race - Backends cloud em paralelo (primeiro resultado válido vence)
+    # =========================================================================
+
+    @staticmethod
+    def _raise_if_stopped(stop: Optional[threading.Event], backend: str):
+        """Levanta RuntimeError se o race já tem vencedor (stop setado)."""
+        if stop is not None and stop.is_set():
+            raise RuntimeError(f"{backend}: cancelado, outro backend venceu o race")
+
+    @staticmethod
+    def _sleep_unless_stopped(delay: float, stop: Optional[threading.Event]):
+        """time.sleep que acorda assim que stop for setado."""
+        if stop is None:
+            time.sleep(delay)
+        else:
+            stop.wait(delay)
+
+    def _transcribe_race(self, audio_path: str, language: str = None) -> Dict[str, Any]:
+        """
+        Transcreve com todos os backends cloud disponíveis em paralelo.
+
+        Retorna o primeiro resultado com palavras; erro ou resultado vazio
+        conta como derrota. O tempo total cai para o do provedor mais rápido
+        em vez de um único provedor fixo.
+
+        Custo: cada provedor cobra pelo áudio que recebeu, então um race
+        custa até a soma dos backends. Quando há vencedor, um evento de
+        parada faz o AssemblyAI parar o polling e os workers do Groq não
+        enviarem novos chunks, mas o que já foi enviado (upload Deepgram em
+        andamento, job AssemblyAI criado, chunks Groq em voo) é cobrado.
+        """
+        backends = [b for b in self.RACE_BACKENDS if self._check_backend_available(b)]
+        if not backends:
+            raise RuntimeError("Nenhum backend cloud disponível para race")
+
+        print(f"  Race entre: {', '.join(backends)}")
+
+        errors = {}
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(backends))
+        try:
+            futures = {
+                executor.submit(
+                    getattr(self, self.TRANSCRIBE_METHODS[b]), audio_path, language,
+                    **({'stop': stop} if b in self.RACE_STOPPABLE else {})
+                ): b
+                for b in backends
+            }
+            for future in as_completed(futures):
+                backend = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[backend] = e
+                    print(f"  Race: {backend} falhou ({e})")
+                    continue
+                if not result.get('words'):
+                    # Sem palavras não serve para legendas: deixar outro vencer
+                    errors[backend] = "resultado sem palavras"
+                    print(f"  Race: {backend} retornou resultado sem palavras")
+                    continue
+                print(f"  Race: {backend} venceu")
+                return result
+        finally:
+            # Avisar os perdedores (AssemblyAI/Groq param no próximo ponto de
+            # checagem) e não esperá-los: o que estiver em voo termina em
+            # background e o resultado é descartado
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        raise RuntimeError(
+            "Todos os backends falharam no race: "
+            + "; ".join(f"{b}: {e}" for b, e in errors.items())
+        )
+
     # =========================================================================
     # Interface principal
     # =========================================================================
 
+    def _needs_enhance(self, result: Dict[str, Any]) -> bool:
+        """Padrão do pós-processamento para o backend que gerou o resultado (race: o vencedor)."""
+        return self.NEEDS_ENHANCE.get(result.get('backend', self.backend), True)
+
+    @staticmethod
+    def _resolve_language(language: Optional[str]) -> Optional[str]:
+        """'auto' -> None (auto-detectar); None -> WHISPER_LANGUAGE."""
+        if language == "auto":
+            return None
+        if language is None:
+            return WHISPER_LANGUAGE
+        return language
+
+    def _apply_enhance(self, result: Dict[str, Any], enhance_timestamps: Optional[bool] = None) -> Dict[str, Any]:
+        """Aplica _enhance_timestamps (None = padrão do backend em NEEDS_ENHANCE)."""
+        if enhance_timestamps is None:
+            enhance_timestamps = self._needs_enhance(result)
+        if enhance_timestamps:
+            result = self._enhance_timestamps(result)
+            print("  Timestamps aprimorados aplicados")
+        return result
+
+    def _transcript_cache_path(self, audio_path: str, language: str, enhance_timestamps: Optional[bool]) -> Path:
+        """
+        Arquivo de cache endereçado por conteúdo para uma transcrição (ver transcript_cache).
+
+        Chave: hash do áudio inteiro + tudo que muda a saída (backend, modelo,
+        idioma, pós-processamento de timestamps).
+        """
+        content_hash = transcript_cache.audio_content_hash(audio_path)
+        return transcript_cache.cache_path(
+            content_hash, 'v2', self.backend, self.model_size, language, enhance_timestamps
+        )
+
     def transcribe(
         self,
         audio_path: str,
         language: str = None,
-        enhance_timestamps: bool = True
+        enhance_timestamps: Optional[bool] = None,
+        cache: bool = True
     ) -> Dict[str, Any]:
         """
         Transcreve áudio usando o backend configurado.
@@ -1077,50 +1694,62 @@ class TranscriberV2:
             audio_path: Caminho do arquivo de áudio
             language: Código do idioma (None para auto-detectar)
             enhance_timestamps: Aplicar pós-processamento de timestamps
+                (None = padrão do backend em NEEDS_ENHANCE; True/False força)
+            cache: Reusar/gravar o resultado em TRANSCRIPTION_CACHE_DIR
+                (desligado também por CLIPGENIUS_NO_TRANSCRIPT_CACHE=1)
 
         Returns:
             Dict com transcrição e timestamps palavra-por-palavra
         """
-        if language == "auto":
-            language = None
-        elif language is None:
-            language = WHISPER_LANGUAGE
+        language = self._resolve_language(language)
+
+        cache_path = None
+        if cache and transcript_cache.cache_enabled():
+            cache_path = self._transcript_cache_path(audio_path, language, enhance_timestamps)
+            cached = transcript_cache.read(cache_path)
+            if cached is not None:
+                print(f"Usando transcrição em cache: {cache_path.name}")
+                return cached
 
         print(f"Transcrevendo com {self.backend}: {audio_path}")
 
-        if self.backend == "deepgram":
-            result = self._transcribe_deepgram(audio_path, language)
-        elif self.backend == "assemblyai":
-            result = self._transcribe_assemblyai(audio_path, language)
-        elif self.backend == "whisperx":
-            result = self._transcribe_whisperx(audio_path, language)
-        elif self.backend == "stable-ts":
-            result = self._transcribe_stable_ts(audio_path, language)
-        elif self.backend == "faster-whisper":
-            result = self._transcribe_faster_whisper(audio_path, language)
-        elif self.backend == "groq":
-            result = self._transcribe_groq(audio_path, language)
-        else:
+        method_name = self.TRANSCRIBE_METHODS.get(self.backend)
+        if method_name is None:
             raise ValueError(f"Backend desconhecido: {self.backend}")
+        result = getattr(self, method_name)(audio_path, language)
 
         # Aplicar pós-processamento de timestamps
-        if enhance_timestamps:
-            result = self._enhance_timestamps(result)
-            print(f"  Timestamps aprimorados aplicados")
+        result = self._apply_enhance(result, enhance_timestamps)
+
+        # Sem palavras = resposta vazia/malformada da API (ou erro): não gravar,
+        # senão toda chamada seguinte receberia o resultado vazio do cache
+        if cache_path is not None and result.get('words'):
+            transcript_cache.write(cache_path, result)
 
         return result
 
-    def transcribe_video(self, video_path: str, language: str = None) -> Dict[str, Any]:
+    def transcribe_video(
+        self,
+        video_path: str,
+        language: str = None,
+        stream_upload: bool = False
+    ) -> Dict[str, Any]:
         """
         Extrai áudio e transcreve vídeo.
 
         Args:
             video_path: Caminho do vídeo
             language: Código do idioma
+            stream_upload: Deepgram/AssemblyAI: enviar a saída do ffmpeg direto
+                para a API, sem WAV em disco. Sem 'audio_path' no resultado e
+                sem cache de transcrição (não há arquivo para gerar a chave).
 
         Returns:
             Dict com transcrição e timestamps
         """
+        if stream_upload and self.backend in self.STREAM_UPLOAD_BACKENDS:
+            return self._transcribe_video_piped(video_path, language)
+
         # Extrair áudio
         audio_path = self.extract_audio(video_path)
 
@@ -1131,9 +1760,123 @@ class TranscriberV2:
             return result
         except Exception as e:
             # Limpar em caso de erro
-            if Path(audio_path).exists():
-                Path(audio_path).unlink()
+            Path(audio_path).unlink(missing_ok=True)
+            raise
+
+    def transcribe_many(
+        self,
+        audio_paths: List[str],
+        language: str = None,
+        max_workers: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Transcreve vários áudios, em paralelo nos backends cloud.
+
+        Uploads e polls de APIs ficam esperando a rede, então até max_workers
+        jobs rodam ao mesmo tempo (5 = limite de jobs simultâneos do plano
+        gratuito do AssemblyAI). Backends locais rodam um por vez: o modelo
+        já ocupa CPU/GPU e não é compartilhado entre threads.
+
+        Args:
+            audio_paths: Caminhos dos arquivos de áudio
+            language: Código do idioma (None para auto-detectar)
+            max_workers: Máximo de transcrições simultâneas (backends cloud)
+
+        Returns:
+            Lista de resultados na mesma ordem de audio_paths
+        """
+        if self.backend not in self.RACE_BACKENDS and self.backend != "race":
+            max_workers = 1
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(audio_paths)))) as executor:
+            futures = [executor.submit(self.transcribe, path, language) for path in audio_paths]
+            return [future.result() for future in futures]
+
+    def _transcribe_video_piped(self, video_path: str, language: str = None) -> Dict[str, Any]:
+        """Transcreve vídeo enviando o áudio do ffmpeg direto (pipe) para a API cloud."""
+        language = self._resolve_language(language)
+
+        proc = self.extract_audio_stream(video_path)
+        drained = False
+
+        def body():
+            nonlocal drained
+            for block in iter(lambda: proc.stdout.read(1 << 16), b''):
+                yield block
+            drained = True
+
+        def finish_ffmpeg(error: Exception = None):
+            # Upload interrompido pela API: ffmpeg ainda está escrevendo
+            if error is not None and not drained:
+                proc.kill()
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            proc.wait()
+            # Se o ffmpeg falhou sozinho (upload vazio/truncado), ele é a causa real
+            if proc.returncode != 0 and drained:
+                raise subprocess.CalledProcessError(
+                    proc.returncode, 'ffmpeg', stderr=stderr[-1024:]
+                ) from error
+
+        print(f"Transcrevendo com {self.backend} (upload via pipe): {video_path}")
+        try:
+            if self.backend == "deepgram":
+                result = self._deepgram_post(body(), 'audio/wav', language)
+            else:
+                upload_url = self._assemblyai_upload(body())
+        except Exception as e:
+            finish_ffmpeg(e)
             raise
+        finish_ffmpeg()
+
+        if self.backend == "assemblyai":
+            result = self._assemblyai_transcribe_url(upload_url, language)
+
+        return self._apply_enhance(result)
+
+    @staticmethod
+    def _range_bounds(items: List[Dict[str, Any]]) -> tuple:
+        """
+        Arrays para achar por bisect os itens que tocam [início, fim].
+
+        - max_ends: máximo acumulado dos fins (sempre crescente), então
+          bisect_left(max_ends, início) é o primeiro item que pode terminar
+          depois do início mesmo se os fins não forem monotônicos.
+        - starts: inícios, ou None se não estiverem ordenados (aí o limite
+          superior cai para len(items) e o filtro fica por conta do loop).
+        """
+        starts = array('d', [it.get('start', 0) for it in items])
+        max_ends = array('d')
+        running = float('-inf')
+        for it in items:
+            end = it.get('end', 0)
+            if end > running:
+                running = end
+            max_ends.append(running)
+        if any(a > b for a, b in zip(starts, starts[1:])):
+            starts = None
+        return max_ends, starts
+
+    def _get_timerange_index(self, transcription: Dict[str, Any]) -> tuple:
+        """
+        Monta (ou reaproveita) o índice de bisect de uma transcrição.
+
+        Cacheado para a última lista de segmentos vista: vários clipes da mesma
+        transcrição montam o índice uma vez só.
+        """
+        segments = transcription.get('segments', [])
+        index = self._timerange_index
+        if index is not None and index[0] is segments:
+            return index
+
+        index = (
+            segments,
+            self._range_bounds(segments),
+            [self._range_bounds(s.get('words', [])) for s in segments]
+        )
+        self._timerange_index = index
+        return index
 
     def get_text_for_timerange(
         self,
@@ -1156,13 +1899,25 @@ class TranscriberV2:
         words = []
         text_parts = []
 
-        for segment in transcription.get('segments', []):
+        all_segments, (seg_max_ends, seg_starts), word_bounds = self._get_timerange_index(transcription)
+
+        # Só os candidatos: do primeiro que pode terminar depois do início
+        # até o último que começa antes do fim
+        lo = bisect_left(seg_max_ends, start_time)
+        hi = bisect_right(seg_starts, end_time) if seg_starts is not None else len(all_segments)
+
+        for i in range(lo, hi):
+            segment = all_segments[i]
             seg_start = segment.get('start', 0)
             seg_end = segment.get('end', 0)
 
             if seg_end >= start_time and seg_start <= end_time:
                 segment_words = []
-                for word in segment.get('words', []):
+                all_words = segment.get('words', [])
+                word_max_ends, word_starts = word_bounds[i]
+                w_lo = bisect_left(word_max_ends, start_time)
+                w_hi = bisect_right(word_starts, end_time) if word_starts is not None else len(all_words)
+                for word in all_words[w_lo:w_hi]:
                     word_start = word.get('start', 0)
                     word_end = word.get('end', 0)
 
@@ -1171,11 +1926,12 @@ class TranscriberV2:
                         words.append(word)
 
                 if segment_words:
-                    text_parts.append(' '.join(w['word'] for w in segment_words))
+                    segment_text = ' '.join(w['word'] for w in segment_words)
+                    text_parts.append(segment_text)
                     segments.append({
                         'start': max(seg_start, start_time),
                         'end': min(seg_end, end_time),
-                        'text': ' '.join(w['word'] for w in segment_words),
+                        'text': segment_text,
                         'words': segment_words
                     })
 
@@ -1189,8 +1945,6 @@ class TranscriberV2:
 
     def unload_model(self):
         """Libera memória do modelo."""
-        import gc
-
         if self._model is not None:
             del self._model
             self._model = None
@@ -1199,18 +1953,13 @@ class TranscriberV2:
             del self._whisperx_model
             self._whisperx_model = None
 
-        if self._align_model is not None:
-            del self._align_model
-            self._align_model = None
+        self._align_model.clear()
 
         gc.collect()
 
-        try:
-            import torch
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-        except ImportError:
-            pass
+        torch = _get_torch()
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
 
         print("Modelo de transcrição liberado da memória")
 
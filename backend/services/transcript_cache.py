@@ -0,0 +1,126 @@
+"""
+ClipGenius - Transcript Cache
+Content-addressed on-disk cache of transcription results, shared by
+WhisperTranscriber and TranscriberV2
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+from config import TRANSCRIPTION_CACHE_DIR
+
+# orjson parses/serializes large word-level transcripts ~2-5x faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# BLAKE3 hashes the audio several times faster than hashlib (SIMD tree hashing)
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+
+# Envelope version written with every entry (bumping it invalidates old entries)
+CACHE_VERSION = 1
+
+# Set to "1" to bypass the cache entirely (no reads, no writes)
+DISABLE_ENV = "CLIPGENIUS_NO_TRANSCRIPT_CACHE"
+
+
+def cache_enabled() -> bool:
+    """False when CLIPGENIUS_NO_TRANSCRIPT_CACHE=1"""
+    return os.getenv(DISABLE_ENV) != "1"
+
+
+def audio_content_hash(audio: Union[str, Path, bytes]) -> str:
+    """
+    Hash of the whole audio (BLAKE3 if installed, blake2b otherwise),
+    file contents streamed in 1MB blocks
+
+    Args:
+        audio: Path to audio file, or in-memory audio bytes
+    """
+    digest = blake3() if BLAKE3_AVAILABLE else hashlib.blake2b(digest_size=16)
+    if isinstance(audio, bytes):
+        digest.update(audio)
+    else:
+        with open(audio, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(content_hash: str, *settings: Any) -> Path:
+    """
+    Cache file for an audio hash plus every setting that changes the output
+    (backend, model, language, ...)
+    """
+    key = "|".join([content_hash, *(str(s) for s in settings)])
+    digest = hashlib.blake2b(key.encode(), digest_size=16)
+    return TRANSCRIPTION_CACHE_DIR / f"{digest.hexdigest()}.json"
+
+
+def read(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Cached result, or None if the entry is missing, unreadable, corrupt or
+    from another CACHE_VERSION
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"Could not read cached transcription ({e}), transcribing again")
+        return None
+    try:
+        envelope = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        if envelope["version"] != CACHE_VERSION:
+            return None
+        return envelope["result"]
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Corrupt cached transcription ({e}), transcribing again")
+        return None
+
+
+def write(path: Path, result: Dict[str, Any]):
+    """
+    Store a result. Written to a unique temp file in the cache dir and renamed
+    into place, so a crash never leaves a truncated entry and concurrent
+    writers of the same key never share a temp file. Failures only log:
+    a cache problem must not fail a successful transcription.
+    """
+    envelope = {
+        "version": CACHE_VERSION,
+        "created": time.time(),
+        "result": result,
+    }
+    tmp_name = None
+    try:
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(envelope, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            data = json.dumps(envelope, ensure_ascii=False).encode('utf-8')
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.stem}.", suffix='.tmp', delete=False
+        ) as tmp:
+            tmp_name = tmp.name
+            tmp.write(data)
+        os.replace(tmp_name, path)
+        tmp_name = None
+    except (OSError, TypeError) as e:
+        # TypeError: unserializable result (orjson.JSONEncodeError subclasses it)
+        print(f"Could not cache transcription: {e}")
+    finally:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass